@@ -0,0 +1,110 @@
+"""Per-frame cost of the shared timeline with many concurrent tracks.
+
+Drives --tracks looping Track playbacks through TIMELINE with the easing
+functions or their lookup tables (Operator.lut), each with Track.play
+setting every value right away and with the batched array path.
+
+usage: python -m benchmark.animation [--tracks N] [--frames N] [--output FILE]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from ui.animation import Operator
+from ui.timeline import TIMELINE, Track, LOOP_FOREVER
+from benchmark.stats import summarize, write_json
+
+OPERATORS = [
+    Operator.ease_in_quad,
+    Operator.ease_out_cubic,
+    Operator.ease_out_bounce,
+    Operator.ease_in_out_bounce,
+    Operator.ease_out_elastic,
+    Operator.ease_in_out_elastic,
+]
+FRAME_TIME = 1 / 30
+
+
+class Target:
+    __slots__ = ("x", "y")
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+
+
+def start_tracks(count, use_lut):
+    targets = []
+    for i in range(count):
+        operator = OPERATORS[i % len(OPERATORS)]
+        if use_lut:
+            operator = Operator.lut(operator)
+        target = Target()
+        # 两个属性，往返循环，保证测量期间一直在播放
+        track = Track(target, [(0.5 + i % 7 * 0.1, {"x": 100 + i, "y": -50 - i})],
+                      operator=operator, loop=LOOP_FOREVER, yoyo=True)
+        TIMELINE.play(track, name=("bench", i))
+        targets.append(target)
+    return targets
+
+
+def bench(count, frames, use_lut, batch):
+    """returns the update timings and the values after the last frame"""
+    TIMELINE.stop()
+    TIMELINE.batch_min = 1 if batch else math.inf
+    clock, TIMELINE.clock = TIMELINE.clock, lambda: 0.0
+    try:
+        targets = start_tracks(count, use_lut)
+        samples = []
+        for frame in range(1, frames + 1):
+            start = time.perf_counter()
+            TIMELINE.update(frame * FRAME_TIME)
+            samples.append(time.perf_counter() - start)
+    finally:
+        TIMELINE.stop()
+        TIMELINE.clock = clock
+    return summarize(samples, scale=1e6), np.array([(t.x, t.y) for t in targets])
+
+
+def lut_error(samples=10001):
+    """max absolute difference between each operator and its table"""
+    progress = np.linspace(0.0, 1.0, samples)
+    errors = {}
+    for operator in OPERATORS:
+        exact = np.array([operator(t) for t in progress.tolist()])
+        errors[operator.__name__] = float(np.max(np.abs(Operator.lut(operator).evaluate(progress) - exact)))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=64)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--output", default=None, help="write the json result to this file")
+    args = parser.parse_args()
+
+    result = {"tracks": args.tracks, "frames": args.frames, "update_us": {}, "lut_error": lut_error()}
+    batch_min = TIMELINE.batch_min
+    values = {}
+    print(f"{'mode':<16}{'p50 (us)':>12}{'p95 (us)':>12}")
+    for use_lut in (False, True):
+        for batch in (False, True):
+            mode = f"{'lut' if use_lut else 'function'}/{'batch' if batch else 'loop'}"
+            stats, values[mode] = bench(args.tracks, args.frames, use_lut, batch)
+            result["update_us"][mode] = stats
+            print(f"{mode:<16}{stats['p50']:>12.1f}{stats['p95']:>12.1f}")
+    TIMELINE.batch_min = batch_min
+
+    # the batched path must land on the same values as setting them one by one
+    for kind in ("function", "lut"):
+        if not np.allclose(values[f"{kind}/loop"], values[f"{kind}/batch"], rtol=0, atol=1e-9):
+            raise AssertionError(f"{kind}/batch differs from {kind}/loop")
+    result["lut_value_error"] = float(np.max(np.abs(values["lut/loop"] - values["function/loop"])))
+    if args.output:
+        write_json(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
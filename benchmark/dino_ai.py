@@ -0,0 +1,122 @@
+"""Sweep the dino AI parameters over many headless games.
+
+Every (safe distance, jump cooldown) pair plays the same seeded obstacle
+courses through DinoSimulation, spread over a process pool, and reports how
+long the AI survives. Games that reach --max-seconds count as survived.
+
+usage: python -m benchmark.dino_ai [--games N] [--workers N] [--write-config]
+"""
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from screen.plugins.dino import DinoSimulation, SIM_STEP, SAFE_DISTANCE, JUMP_COOLDOWN
+from until.config import config
+from benchmark.stats import summarize, write_json
+
+# same file as screen.plugin.CONFIG_PATH, importing that module would load every plugin
+CONFIG_PATH = "config/plugins.json"
+
+SAFE_DISTANCES = list(range(4, 42, 2))
+JUMP_COOLDOWNS = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+
+
+def play(job):
+    """simulation steps survived on each seed for one parameter pair"""
+    safe_distance, jump_cooldown, seeds, max_steps = job
+    return [
+        DinoSimulation(seed=seed, safe_distance=safe_distance, jump_cooldown=jump_cooldown).run(max_steps)
+        for seed in seeds
+    ]
+
+
+def sweep(games, max_seconds, workers, seed=0):
+    seeds = range(seed, seed + games)
+    max_steps = round(max_seconds / SIM_STEP)
+    pairs = list(itertools.product(SAFE_DISTANCES, JUMP_COOLDOWNS))
+    jobs = [(safe_distance, jump_cooldown, seeds, max_steps) for safe_distance, jump_cooldown in pairs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(play, jobs)
+        rows = []
+        for (safe_distance, jump_cooldown), steps in zip(pairs, results):
+            survival = [count * SIM_STEP for count in steps]
+            stats = summarize(survival, scale=1)
+            stats["p10"] = sorted(survival)[len(survival) // 10]
+            stats["survived"] = sum(count >= max_steps for count in steps) / len(steps)
+            rows.append({"safe_distance": safe_distance, "jump_cooldown": jump_cooldown, "seconds": stats})
+    return rows
+
+
+def current_params(path=CONFIG_PATH):
+    """the (safe distance, jump cooldown) pair the dino plugin runs with,
+    the plugin defaults where the config leaves them out"""
+    for plugin_info in config.open(path).get("plugins", []):
+        if plugin_info["name"] == "dino":
+            dino_config = plugin_info.get("config") or {}
+            return (dino_config.get("safe_distance", SAFE_DISTANCE),
+                    dino_config.get("jump_cooldown", JUMP_COOLDOWN))
+    return (SAFE_DISTANCE, JUMP_COOLDOWN)
+
+
+def rank(row, current):
+    """most games survived first, then the longest worst-case and typical runs,
+    ties go to the pair closest to the current one"""
+    stats = row["seconds"]
+    distance = abs(row["safe_distance"] - current[0]) + abs(row["jump_cooldown"] - current[1]) * 10
+    return (stats["survived"], stats["p10"], stats["p50"], -distance)
+
+
+def save_best(best, path=CONFIG_PATH):
+    """write the winning parameters into the dino plugin's config entry"""
+    data = config.open(path)
+    for plugin_info in data.get("plugins", []):
+        if plugin_info["name"] == "dino":
+            plugin_info.setdefault("config", {}).update(
+                safe_distance=best["safe_distance"],
+                jump_cooldown=best["jump_cooldown"],
+            )
+            config.save(path, data)
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=64, help="seeded games per parameter pair")
+    parser.add_argument("--max-seconds", type=float, default=300, help="stop a game after this much game time")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size, one per cpu by default")
+    parser.add_argument("--seed", type=int, default=0, help="first obstacle course seed")
+    parser.add_argument("--top", type=int, default=10, help="rows to print")
+    parser.add_argument("--write-config", action="store_true", help=f"store the best pair in {CONFIG_PATH}")
+    parser.add_argument("--output", default=None, help="write the json result to this file")
+    args = parser.parse_args()
+
+    current = current_params()
+    start = time.perf_counter()
+    rows = sorted(sweep(args.games, args.max_seconds, args.workers, args.seed),
+                  key=lambda row: rank(row, current), reverse=True)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(rows)} pairs x {args.games} games in {elapsed:.1f}s")
+    print(f"{'safe':>6}{'cooldown':>10}{'survived':>10}{'p10 (s)':>10}{'p50 (s)':>10}{'mean (s)':>10}")
+    shown = rows[:args.top]
+    shown += [row for row in rows[args.top:] if (row["safe_distance"], row["jump_cooldown"]) == current]
+    for row in shown:
+        stats = row["seconds"]
+        marker = " (current)" if (row["safe_distance"], row["jump_cooldown"]) == current else ""
+        print(f"{row['safe_distance']:>6}{row['jump_cooldown']:>10.1f}{stats['survived']:>10.0%}"
+              f"{stats['p10']:>10.1f}{stats['p50']:>10.1f}{stats['mean']:>10.1f}{marker}")
+
+    best = rows[0]
+    if args.write_config:
+        if save_best(best):
+            print(f"saved safe_distance={best['safe_distance']} jump_cooldown={best['jump_cooldown']} to {CONFIG_PATH}")
+        else:
+            print(f"no dino entry in {CONFIG_PATH}")
+    if args.output:
+        write_json({"games": args.games, "max_seconds": args.max_seconds, "current": current, "rows": rows}, args.output)
+
+
+if __name__ == "__main__":
+    main()
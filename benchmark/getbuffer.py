@@ -0,0 +1,80 @@
+"""Compare the legacy per-pixel getbuffer loop with drive.framebuffer.pack_pages.
+
+usage: python -m benchmark.getbuffer [--frames N]
+"""
+import argparse
+import random
+import time
+
+from PIL import Image, ImageDraw
+from drive.framebuffer import pack_pages
+
+WIDTH = 128
+HEIGHT = 32
+
+
+def legacy_pack_pages(image, width, height):
+    """the original SSD1305.getbuffer loop, kept as reference"""
+    pages = height // 8
+    buffer = [0] * (width * pages)
+    pix = image.load()
+    index = 0
+    for page in range(pages):
+        for x in range(width):
+            bits = 0
+            for bit in [0, 1, 2, 3, 4, 5, 6, 7]:
+                bits = bits << 1
+                bits |= 0 if pix[(x, page * 8 + 7 - bit)] == 0 else 1
+            buffer[index] = bits
+            index += 1
+    return buffer
+
+
+def make_frames():
+    """fixed test frames: blank, full, checker, seeded noise and text"""
+    frames = {}
+    frames["blank"] = Image.new("1", (WIDTH, HEIGHT), 0)
+    frames["full"] = Image.new("1", (WIDTH, HEIGHT), 1)
+
+    checker = Image.new("1", (WIDTH, HEIGHT), 0)
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            checker.putpixel((x, y), (x + y) & 1)
+    frames["checker"] = checker
+
+    rng = random.Random(1305)
+    noise = Image.new("1", (WIDTH, HEIGHT), 0)
+    noise.putdata([rng.randint(0, 1) for _ in range(WIDTH * HEIGHT)])
+    frames["noise"] = noise
+
+    text = Image.new("1", (WIDTH, HEIGHT), 0)
+    draw = ImageDraw.Draw(text)
+    draw.rectangle((0, 0, WIDTH - 1, HEIGHT - 1), outline=255)
+    draw.text((20, 10), "Muspi 12:34:56", fill=255)
+    frames["text"] = text
+    return frames
+
+
+def bench(func, image, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func(image, WIDTH, HEIGHT)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'frame':<10}{'legacy (us)':>14}{'packed (us)':>14}{'speedup':>10}")
+    for name, image in make_frames().items():
+        if bytes(legacy_pack_pages(image, WIDTH, HEIGHT)) != pack_pages(image, WIDTH, HEIGHT):
+            raise AssertionError(f"pack_pages mismatch on frame '{name}'")
+        legacy = bench(legacy_pack_pages, image, args.frames)
+        packed = bench(pack_pages, image, args.frames)
+        print(f"{name:<10}{legacy * 1e6:>14.1f}{packed * 1e6:>14.1f}{legacy / packed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Per-generation cost of the Game of Life plugin.
+
+Replays the same random boards through the original list-of-lists step and
+per-cell rectangles and through the numpy board, checks that both draw the
+same pixels, then times LifeBoard.step alone on larger virtual boards.
+
+usage: python -m benchmark.life [--generations N] [--output FILE]
+"""
+import argparse
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from screen.plugins.life import life, LifeBoard
+from benchmark.stats import summarize, write_json
+
+WIDTH, HEIGHT = 128, 32
+BOARD_SIZES = [(64, 16), (256, 64), (512, 128)]
+
+
+def legacy_update(grid, draw, cell_size):
+    """the original update: modulo neighbour count and one rectangle per cell"""
+    height, width = len(grid), len(grid[0])
+    new_grid = [[0] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            neighbors = 0
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if dx or dy:
+                        neighbors += grid[(y + dy) % height][(x + dx) % width]
+            if grid[y][x] == 1:
+                new_grid[y][x] = 1 if 2 <= neighbors <= 3 else 0
+            elif neighbors == 3:
+                new_grid[y][x] = 1
+    draw.rectangle((0, 0, WIDTH, HEIGHT), fill=0)
+    for y in range(height):
+        for x in range(width):
+            if new_grid[y][x] == 1:
+                draw.rectangle([x * cell_size, y * cell_size,
+                                (x + 1) * cell_size - 1, (y + 1) * cell_size - 1], fill=1)
+    return new_grid
+
+
+def compare(generations, seed=0):
+    """run both implementations side by side, return the per-frame samples"""
+    plugin = life(None, WIDTH, HEIGHT)
+    plugin.board.rng = np.random.default_rng(seed)
+    plugin.initialize_grid()
+    grid = plugin.board.cells.tolist()
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+
+    legacy, vectorized = [], []
+    for generation in range(generations):
+        start = time.perf_counter()
+        grid = legacy_update(grid, draw, plugin.cell_size)
+        legacy.append(time.perf_counter() - start)
+
+        reseeds = plugin.reseeds
+        start = time.perf_counter()
+        plugin.update()
+        vectorized.append(time.perf_counter() - start)
+
+        if plugin.reseeds != reseeds:
+            # the plugin reseeded after a cycle, continue the legacy run from the new board
+            grid = plugin.board.cells.tolist()
+            continue
+        if image.tobytes() != plugin.image.tobytes():
+            raise AssertionError(f"boards diverge at generation {generation}")
+    return legacy, vectorized
+
+
+def bench_board(width, height, generations):
+    board = LifeBoard(width, height, rng=np.random.default_rng(0))
+    board.seed()
+    samples = []
+    for _ in range(generations):
+        start = time.perf_counter()
+        board.step()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, scale=1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--generations", type=int, default=300)
+    parser.add_argument("--output", default=None, help="write the json result to this file")
+    args = parser.parse_args()
+
+    legacy, vectorized = compare(args.generations)
+    result = {
+        "generations": args.generations,
+        "update_ms": {"legacy": summarize(legacy), "numpy": summarize(vectorized)},
+        "step_us": {},
+    }
+    print(f"{'update':<16}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for mode, stats in result["update_ms"].items():
+        print(f"{mode:<16}{stats['p50']:>12.3f}{stats['p95']:>12.3f}")
+
+    print(f"\n{'board':<16}{'p50 (us)':>12}{'p95 (us)':>12}")
+    for width, height in BOARD_SIZES:
+        stats = bench_board(width, height, args.generations)
+        result["step_us"][f"{width}x{height}"] = stats
+        print(f"{f'{width}x{height}':<16}{stats['p50']:>12.1f}{stats['p95']:>12.1f}")
+    if args.output:
+        write_json(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Drive every display plugin against a VirtualDisplay and time each frame.
+
+Per plugin it reports render (update + get_image + compositing), packing
+(getbuffer) and transfer (ShowImage, plus the simulated bus time) as
+p50/p95/p99 in milliseconds, and the traced memory allocated per frame.
+
+usage: python -m benchmark.plugins [--frames N] [--plugins clock dino] [--output result.json]
+"""
+import argparse
+import importlib
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+
+from drive.virtual import VirtualDisplay
+from screen.manager import DisplayManager
+from until.log import LOGGER
+from ui.timer import TIMERS
+from ui.timeline import TIMELINE
+from benchmark.stats import summarize, write_json
+
+PLUGINS = ["xiaozhi", "clock", "dino", "life"]
+
+# methods that reach the network or audio devices, skipped when benchmarking
+OFFLINE_STUBS = {
+    "xiaozhi": ["_get_ota_version"],
+}
+
+
+def load_plugin(name):
+    """import the plugin class, with its online setup disabled"""
+    module = importlib.import_module(f"screen.plugins.{name}")
+    plugin_class = getattr(module, name)
+    stubs = OFFLINE_STUBS.get(name)
+    if stubs:
+        plugin_class = type(name, (plugin_class,), {stub: lambda self: None for stub in stubs})
+    return plugin_class
+
+
+class FrameClock:
+    """simulated clock for plugins with a `clock` attribute (dino's fixed-step
+    simulation), advanced by one frame period per rendered frame so frames
+    rendered back to back still move the game"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def render_frame(manager, plugin):
+    clock = getattr(plugin, "clock", None)
+    if isinstance(clock, FrameClock):
+        clock.now += plugin.get_frame_time()
+    TIMERS.run_due()
+    TIMELINE.update()
+    plugin.update()
+    manager.main_screen.paste(plugin.get_image(), (0, 0))
+
+
+def bench_plugin(manager, plugin, frames, warmup):
+    disp = manager.disp
+    if hasattr(plugin, "clock"):
+        plugin.clock = FrameClock()
+    plugin.set_active(True)
+    for _ in range(warmup):
+        render_frame(manager, plugin)
+        disp.getbuffer(manager.main_screen)
+        disp.ShowImage()
+
+    render, pack, transfer, bus = [], [], [], []
+    bytes_start = disp.total_bytes_sent
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        render_frame(manager, plugin)
+        t1 = time.perf_counter()
+        disp.getbuffer(manager.main_screen)
+        t2 = time.perf_counter()
+        bus_start = disp.bus_time
+        disp.ShowImage()
+        t3 = time.perf_counter()
+        render.append(t1 - t0)
+        pack.append(t2 - t1)
+        transfer.append(t3 - t2)
+        bus.append(disp.bus_time - bus_start)
+    bytes_sent = disp.total_bytes_sent - bytes_start
+
+    # allocations are measured in a separate pass, tracing slows everything down
+    alloc_bytes, alloc_blocks = [], []
+    tracemalloc.start()
+    for _ in range(min(frames, 100)):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        render_frame(manager, plugin)
+        disp.getbuffer(manager.main_screen)
+        disp.ShowImage()
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_bytes.append(peak - before)
+        alloc_blocks.append(sys.getallocatedblocks() - blocks)
+    tracemalloc.stop()
+    plugin.set_active(False)
+
+    return {
+        "frames": frames,
+        "frame_budget_ms": plugin.get_frame_time() * 1e3,
+        "render_ms": summarize(render),
+        "pack_ms": summarize(pack),
+        "transfer_ms": summarize(transfer),
+        "bus_ms": summarize(bus),
+        "alloc_peak_bytes": summarize(alloc_bytes, scale=1),
+        "alloc_net_blocks": summarize(alloc_blocks, scale=1),
+        "bytes_sent_per_frame": bytes_sent / frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--plugins", nargs="*", default=PLUGINS)
+    parser.add_argument("--output", help="write json here instead of stdout")
+    args = parser.parse_args()
+
+    LOGGER.setLevel(logging.WARNING)
+    disp = VirtualDisplay()
+    manager = DisplayManager(disp=disp)
+
+    result = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "plugins": {},
+    }
+    for name in args.plugins:
+        try:
+            manager.add_plugin(load_plugin(name))
+            plugin = manager.plugins[-1]["plugin"]
+        except Exception as e:
+            LOGGER.warning(f"skip plugin {name}: {e}")
+            result["plugins"][name] = {"error": str(e)}
+            continue
+        result["plugins"][name] = bench_plugin(manager, plugin, args.frames, args.warmup)
+
+    write_json(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
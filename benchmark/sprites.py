@@ -0,0 +1,84 @@
+"""Compare the legacy per-point dino sprite drawing with the compiled masks.
+
+usage: python -m benchmark.sprites [--frames N]
+"""
+import argparse
+import time
+
+from PIL import Image, ImageDraw
+from screen.plugins.dino import (
+    WIDTH, HEIGHT, GROUND_Y, DINO_WIDTH, DINO_HEIGHT, OBSTACLE_WIDTH,
+    CACTUS_SPRITE_12, CACTUS_SPRITE_9, CACTUS_SPRITE_6,
+    DINO_SPRITES, CACTUS_SPRITES, get_dino_sprite,
+)
+
+CACTI = {12: CACTUS_SPRITE_12, 9: CACTUS_SPRITE_9, 6: CACTUS_SPRITE_6}
+
+
+def make_scenes():
+    """fixed scenes: (dino sprite type, dino y, [(cactus height, x), ...])"""
+    ground = GROUND_Y - DINO_HEIGHT
+    return {
+        "run": (1, ground, [(12, 60), (6, 110)]),
+        "jump": (2, ground - 14, [(9, 14), (12, 70), (6, 126)]),
+        "crash": (3, ground, [(12, 26), (9, 90)]),
+        "edge": (1, ground, [(6, -2), (9, 40), (12, 80), (6, 125)]),
+    }
+
+
+def legacy_draw(draw, scene):
+    """the original draw loops: rebuild the sprite and one point per pixel"""
+    sprite_type, dino_y, cacti = scene
+    draw.rectangle((0, 0, WIDTH, HEIGHT), fill=0)
+    draw.line((0, GROUND_Y, WIDTH, GROUND_Y), fill=255)
+    sprite = get_dino_sprite(sprite_type)
+    for i in range(DINO_HEIGHT):
+        for j in range(DINO_WIDTH):
+            if sprite[i][j]:
+                draw.point((10 + j, dino_y + i), fill=255)
+    for height, x in cacti:
+        cactus = CACTI[height]
+        for i in range(height):
+            for j in range(OBSTACLE_WIDTH):
+                if cactus[i][j]:
+                    draw.point((x + j, GROUND_Y - height + i), fill=255)
+
+
+def masked_draw(draw, scene):
+    sprite_type, dino_y, cacti = scene
+    draw.rectangle((0, 0, WIDTH, HEIGHT), fill=0)
+    draw.line((0, GROUND_Y, WIDTH, GROUND_Y), fill=255)
+    DINO_SPRITES[sprite_type].draw((10, dino_y), draw=draw)
+    for height, x in cacti:
+        CACTUS_SPRITES[height].draw((x, GROUND_Y - height), draw=draw)
+
+
+def bench(func, scene, frames):
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+    start = time.perf_counter()
+    for _ in range(frames):
+        func(draw, scene)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'scene':<10}{'legacy (us)':>14}{'masked (us)':>14}{'speedup':>10}")
+    for name, scene in make_scenes().items():
+        legacy_image = Image.new("1", (WIDTH, HEIGHT))
+        masked_image = Image.new("1", (WIDTH, HEIGHT))
+        legacy_draw(ImageDraw.Draw(legacy_image), scene)
+        masked_draw(ImageDraw.Draw(masked_image), scene)
+        if legacy_image.tobytes() != masked_image.tobytes():
+            raise AssertionError(f"masked sprites differ on scene '{name}'")
+        legacy = bench(legacy_draw, scene, args.frames)
+        masked = bench(masked_draw, scene, args.frames)
+        print(f"{name:<10}{legacy * 1e6:>14.1f}{masked * 1e6:>14.1f}{legacy / masked:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
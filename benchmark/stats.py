@@ -0,0 +1,35 @@
+"""Small helpers shared by the benchmark scripts."""
+import json
+import sys
+
+
+def percentile(samples, p):
+    """nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, scale=1e3):
+    """p50/p95/p99/max/mean of samples, in milliseconds by default"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+    return {
+        "p50": percentile(samples, 50) * scale,
+        "p95": percentile(samples, 95) * scale,
+        "p99": percentile(samples, 99) * scale,
+        "max": max(samples) * scale,
+        "mean": sum(samples) / len(samples) * scale,
+    }
+
+
+def write_json(result, path=None):
+    """dump the result to path, or stdout when path is None"""
+    if path is None:
+        json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
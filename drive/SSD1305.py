@@ -1,5 +1,6 @@
 #coding=utf-8
 from . import config
+from .framebuffer import pack_pages, write_dirty
 import time
 
 Device_SPI = config.Device_SPI
@@ -27,7 +28,14 @@ class SSD1305(object):
         self.width = OLED_WIDTH
         self.height = OLED_HEIGHT
         self._pages = self.height // 8
-        self._buffer = [0]*(self.width*self._pages)
+        self._buffer = bytearray(self.width*self._pages)
+        # last buffer written to panel RAM, None when the RAM is unknown
+        self._sent = None
+        # bus traffic of the last ShowImage and since start
+        self.bytes_sent = 0
+        self.bytes_skipped = 0
+        self.total_bytes_sent = 0
+        self.total_bytes_skipped = 0
         #Initialize DC RST pin
         self.RPI = config.RaspberryPi()
         self._dc = self.RPI.GPIO_DC_PIN
@@ -42,6 +50,21 @@ class SSD1305(object):
         else:
             self.RPI.i2c_writebyte(0x00, cmd)
 
+    def data(self, buf):
+        """Send a run of display RAM bytes as one bus transfer"""
+        if(self.Device == Device_SPI):
+            self.RPI.digital_write(self._dc,True)
+            self.RPI.spi_writebytes(buf)
+        else:
+            self.RPI.i2c_writeblock(0x40, buf)
+
+    def commands(self, *cmds):
+        """Send several command bytes in one bus transfer"""
+        if(self.Device == Device_SPI):
+            self.RPI.digital_write(self._dc,False)
+            self.RPI.spi_writebytes(bytes(cmds))
+        else:
+            self.RPI.i2c_writeblock(0x00, cmds)
 
     def Init(self):
         if (self.RPI.module_init() != 0):
@@ -89,6 +112,7 @@ class SSD1305(object):
 
     def reset(self):
         """Reset the display"""
+        self._sent = None
         self.RPI.digital_write(self._rst,True)
         time.sleep(0.1)
         self.RPI.digital_write(self._rst,False)
@@ -100,51 +124,17 @@ class SSD1305(object):
         """Set buffer to value of Python Imaging Library image.  The image should
         be in 1 bit mode and a size equal to the display size.
         """
-        if image.mode != '1':
-            raise ValueError('Image must be in mode 1.')
-        imwidth, imheight = image.size
-        if imwidth != self.width or imheight != self.height:
-            raise ValueError('Image must be same dimensions as display ({0}x{1}).' \
-                .format(self.width, self.height))
-        # Grab all the pixels from the image, faster than getpixel.
-        pix = image.load()
-        # Iterate through the memory pages
-        index = 0
-        for page in range(self._pages):
-            # Iterate through all x axis columns.
-            for x in range(self.width):
-                # Set the bits for the column of pixels at the current position.
-                bits = 0
-                # Don't use range here as it's a bit slow
-                for bit in [0, 1, 2, 3, 4, 5, 6, 7]:
-                    bits = bits << 1
-                    bits |= 0 if pix[(x, page*8+7-bit)] == 0 else 1
-                # Update buffer byte and increment to next byte.
-                self._buffer[index] = bits
-                index += 1
+        self._buffer = pack_pages(image, self.width, self.height)
 
     
     def ShowImage(self):
-        for page in range(0,self._pages):
-            # set page address #
-            self.command(0xB0 + page)
-            # set low column address #
-            if self.rotation == 0:
-                self.command(0x04)  # 增加4像素偏移
-            else:
-                self.command(0x00)
-            # set high column address #
-            self.command(0x10) 
-            # write data #
-            # time.sleep(0.01)
-            if(self.Device == Device_SPI):
-                self.RPI.digital_write(self._dc,True)
-            for i in range(0,self.width):
-                if(self.Device == Device_SPI):
-                    # self.RPI.digital_write(self._dc,True)
-                    self.RPI.spi_writebyte([self._buffer[i+self.width*page]]) 
-                else :
-                    self.RPI.i2c_writebyte(0x40, self._buffer[i+self.width*page])
+        """Write the columns that changed since the last ShowImage"""
+        offset = 0x04 if self.rotation == 0 else 0x00  # 增加4像素偏移
+        write_dirty(self, offset)
+
+    def invalidate(self):
+        """Force the next ShowImage to resend the whole frame"""
+        self._sent = None
 
     def clear(self):
         """Clear contents of image buffer"""
@@ -194,6 +184,7 @@ class SSD1305(object):
         Args:
             rotation (int): 旋转角度，0-1
         """
+        self._sent = None
         if rotation == 0:
             self.rotation = 0
             self.command(0xA1)#--Set Segment Re-map (A1->A0 for 180° rotation)
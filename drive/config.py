@@ -34,6 +34,8 @@ import spidev
 # import ctypes
 from gpiozero import DigitalOutputDevice,DigitalInputDevice,PWMOutputDevice
 
+from .framebuffer import I2C_BLOCK_MAX
+
 # Pin definition
 RST_PIN         = 25
 DC_PIN          = 24
@@ -89,8 +91,17 @@ class RaspberryPi:
     def spi_writebyte(self,data):
         self.spi.writebytes([data[0]])
 
+    def spi_writebytes(self,data):
+        """write a whole buffer in one transfer, spidev splits it by bufsiz"""
+        self.spi.writebytes2(data)
+
     def i2c_writebyte(self,reg, value):
         self.bus.write_byte_data(self.address, reg, value)
+
+    def i2c_writeblock(self,reg, data):
+        """write a buffer as i2c block writes chunked to I2C_BLOCK_MAX"""
+        for i in range(0, len(data), I2C_BLOCK_MAX):
+            self.bus.write_i2c_block_data(self.address, reg, list(data[i:i+I2C_BLOCK_MAX]))
     
     def module_init(self): 
         self.digital_write(self.GPIO_RST_PIN,False)
@@ -0,0 +1,85 @@
+#coding=utf-8
+import numpy as np
+from PIL import Image
+
+# smbus limits a block write to 32 data bytes
+I2C_BLOCK_MAX = 32
+
+
+def check_image(image, width, height):
+    """Validate that image is a mode '1' PIL image of the display size."""
+    if image.mode != '1':
+        raise ValueError('Image must be in mode 1.')
+    imwidth, imheight = image.size
+    if imwidth != width or imheight != height:
+        raise ValueError('Image must be same dimensions as display ({0}x{1}).' \
+            .format(width, height))
+
+
+def pack_pages(image, width, height):
+    """Pack a mode '1' image into the SSD1305 page-ordered buffer.
+
+    Every page is 8 rows high and stored as one byte per column, the top
+    row of the page in the least significant bit. Returns a bytearray of
+    width * height // 8 bytes.
+    """
+    check_image(image, width, height)
+    # tobytes() gives rows packed MSB first, one bit per pixel
+    rows = np.frombuffer(image.tobytes(), dtype=np.uint8)
+    bits = np.unpackbits(rows).reshape(height, -1)[:, :width]
+    # (pages, 8, width) -> one byte per column, row 0 of the page as bit 0
+    pages = np.packbits(bits.reshape(height // 8, 8, width), axis=1, bitorder='little')
+    return bytearray(pages.tobytes())
+
+
+def dirty_spans(buffer, previous, width, height, merge_gap=8):
+    """List the column ranges that differ between two packed buffers.
+
+    Returns (page, start, end) tuples with end exclusive. Changed runs in a
+    page closer than merge_gap columns are merged, because every extra run
+    costs a column address command and a separate transfer. A previous of
+    None marks every page as dirty.
+    """
+    pages = height // 8
+    if previous is None:
+        return [(page, 0, width) for page in range(pages)]
+    current = np.frombuffer(buffer, dtype=np.uint8).reshape(pages, width)
+    last = np.frombuffer(previous, dtype=np.uint8).reshape(pages, width)
+    changed = current != last
+    spans = []
+    for page in np.flatnonzero(changed.any(axis=1)):
+        columns = np.flatnonzero(changed[page])
+        # split wherever two changed columns are further apart than merge_gap
+        breaks = np.flatnonzero(np.diff(columns) > merge_gap)
+        starts = np.concatenate(([columns[0]], columns[breaks + 1]))
+        ends = np.concatenate((columns[breaks], [columns[-1]])) + 1
+        spans.extend((int(page), int(s), int(e)) for s, e in zip(starts, ends))
+    return spans
+
+
+def write_dirty(disp, offset):
+    """Send the spans of disp._buffer that changed since disp._sent.
+
+    disp provides commands() and data() and keeps the byte counters; offset
+    is the column of the first visible pixel in panel RAM.
+    """
+    sent = 0
+    for page, start, end in dirty_spans(disp._buffer, disp._sent, disp.width, disp.height):
+        column = start + offset
+        # set page address, low column address, high column address
+        disp.commands(0xB0 + page, column & 0x0F, 0x10 | (column >> 4))
+        disp.data(disp._buffer[disp.width*page+start:disp.width*page+end])
+        sent += end - start
+    disp._sent = bytes(disp._buffer)
+
+    disp.bytes_sent = sent
+    disp.bytes_skipped = len(disp._buffer) - sent
+    disp.total_bytes_sent += disp.bytes_sent
+    disp.total_bytes_skipped += disp.bytes_skipped
+
+
+def unpack_pages(buffer, width, height):
+    """Turn a page-ordered buffer back into a mode '1' image."""
+    pages = np.frombuffer(bytes(buffer), dtype=np.uint8).reshape(height // 8, 1, width)
+    bits = np.unpackbits(pages, axis=1, bitorder='little').reshape(height, width)
+    return Image.frombytes('1', (width, height), np.packbits(bits, axis=1).tobytes())
@@ -0,0 +1,178 @@
+#coding=utf-8
+import time
+from collections import deque
+from pathlib import Path
+
+from .framebuffer import I2C_BLOCK_MAX, pack_pages, write_dirty, unpack_pages
+
+OLED_WIDTH   = 128 #OLED width
+OLED_HEIGHT  = 32  #OLED height
+
+BUS_SPI = "spi"
+BUS_I2C = "i2c"
+
+RAM_COLUMNS = 132  # SSD1305 display RAM is 132 columns wide, the panel shows 128 of them
+
+
+class VirtualDisplay(object):
+    """Headless stand-in for SSD1305, no spidev/smbus/gpiozero needed.
+
+    The page and column address commands and the data() writes go into a
+    simulated display RAM, so frames (the last max_frames, optionally
+    written to record_dir as PNG) show only what was actually transferred. Bus time is computed from the bytes the real
+    driver would send; with simulate_timing the calls also sleep for it,
+    so frame pacing matches the panel.
+    """
+
+    def __init__(self, width=OLED_WIDTH, height=OLED_HEIGHT, bus=BUS_SPI, bus_hz=1000000,
+                 transfer_overhead=0.00005, reset_time=0.3, simulate_timing=False,
+                 max_frames=64, record_dir=None):
+        self.width = width
+        self.height = height
+        self._pages = self.height // 8
+        self._buffer = bytearray(self.width*self._pages)
+        self._sent = None
+        self.rotation = 0
+        self._ram = bytearray(RAM_COLUMNS*self._pages)
+        self._page = 0
+        self._column = 0
+        self.contrast = 0x80
+        self.is_on = False
+
+        # bus model
+        self.bus = bus
+        self.bus_hz = bus_hz
+        self.transfer_overhead = transfer_overhead  # per transfer (syscall, DC toggle)
+        self.reset_time = reset_time
+        self.simulate_timing = simulate_timing
+
+        # recording
+        self.frames = deque(maxlen=max_frames)  # (timestamp, visible RAM)
+        self.record_dir = Path(record_dir) if record_dir else None
+        if self.record_dir:
+            self.record_dir.mkdir(parents=True, exist_ok=True)
+
+        # statistics, same names as SSD1305
+        self.bytes_sent = 0
+        self.bytes_skipped = 0
+        self.total_bytes_sent = 0
+        self.total_bytes_skipped = 0
+        self.frame_count = 0
+        self.commands_sent = 0
+        self.bus_time = 0.0  # simulated seconds spent on the bus
+
+    def _transfer(self, nbytes):
+        """account for one bus transfer of nbytes"""
+        if self.bus == BUS_SPI:
+            transfers = 1
+            bits = nbytes * 8
+        else:
+            # block writes: address + register + data, each byte acked
+            transfers = (nbytes + I2C_BLOCK_MAX - 1) // I2C_BLOCK_MAX
+            bits = (nbytes + 2 * transfers) * 9
+        cost = transfers * self.transfer_overhead + bits / self.bus_hz
+        self.bus_time += cost
+        if self.simulate_timing:
+            time.sleep(cost)
+
+    def command(self, cmd):
+        self.commands_sent += 1
+        if cmd == 0xAE:
+            self.is_on = False
+        elif cmd == 0xAF:
+            self.is_on = True
+        self._transfer(1)
+
+    def commands(self, *cmds):
+        self.commands_sent += len(cmds)
+        for cmd in cmds:
+            # page addressing mode: 0xB0-0xB7 page, 0x00-0x0F low and 0x10-0x1F high column nibble
+            if 0xB0 <= cmd <= 0xB7:
+                self._page = cmd & 0x07
+            elif cmd <= 0x0F:
+                self._column = (self._column & 0xF0) | cmd
+            elif cmd <= 0x1F:
+                self._column = (self._column & 0x0F) | ((cmd & 0x0F) << 4)
+        self._transfer(len(cmds))
+
+    def data(self, buf):
+        if self._page < self._pages:
+            # the column pointer advances after each byte and stays inside the page
+            start = RAM_COLUMNS*self._page + self._column
+            end = min(start + len(buf), RAM_COLUMNS*(self._page + 1))
+            self._ram[start:end] = buf[:end - start]
+            self._column = min(self._column + len(buf), RAM_COLUMNS - 1)
+        self._transfer(len(buf))
+
+    def Init(self):
+        """Initialize dispaly"""
+        self.reset()
+        self.command(0xAE)
+        self.contrast = 0x80
+        self.command(0xAF)
+
+    def reset(self):
+        """Reset the display"""
+        self._sent = None
+        self.is_on = False
+        if self.simulate_timing:
+            time.sleep(self.reset_time)
+
+    def getbuffer(self, image):
+        """Set buffer to value of Python Imaging Library image.  The image should
+        be in 1 bit mode and a size equal to the display size.
+        """
+        self._buffer = pack_pages(image, self.width, self.height)
+
+    def ShowImage(self):
+        """Write the columns that changed since the last ShowImage"""
+        offset = 0x04 if self.rotation == 0 else 0x00
+        write_dirty(self, offset)
+        self._record()
+
+    def _record(self):
+        self.frames.append((time.monotonic(), self._visible()))
+        if self.record_dir:
+            self.get_image().save(self.record_dir / f"frame_{self.frame_count:06d}.png")
+        self.frame_count += 1
+
+    def invalidate(self):
+        """Force the next ShowImage to resend the whole frame"""
+        self._sent = None
+
+    def clear(self):
+        """Clear contents of image buffer"""
+        self.ShowImage()
+
+    def set_contrast(self, contrast):
+        contrast = max(0, min(255, contrast))
+        self.command(0x81)
+        self.command(contrast)
+        self.contrast = contrast
+
+    def set_screen_rotation(self, rotation):
+        self._sent = None
+        self.rotation = rotation
+        self.command(0xA0 if rotation else 0xA1)
+        self.command(0xC0 if rotation else 0xC8)
+
+    def _visible(self):
+        """the columns of display RAM the panel shows, packed like getbuffer()"""
+        offset = 0x04 if self.rotation == 0 else 0x00
+        ram = memoryview(self._ram)
+        return b"".join(
+            ram[RAM_COLUMNS*page+offset:RAM_COLUMNS*page+offset+self.width] for page in range(self._pages)
+        )
+
+    def get_image(self):
+        """Image of what the panel currently shows"""
+        return unpack_pages(self._visible(), self.width, self.height)
+
+    def get_stats(self):
+        return {
+            "frames": self.frame_count,
+            "bytes_sent": self.total_bytes_sent,
+            "bytes_skipped": self.total_bytes_skipped,
+            "commands": self.commands_sent,
+            "bus_time": self.bus_time,
+        }
@@ -37,19 +37,38 @@
 #           '~ .~~~. ~'      Created by PuterJam               
 #               '~'        
 
-# add oled driver
-from drive import SSD1305
+import argparse
 
 # add Display Manager
 from screen.manager import DisplayManager
+from screen.profiler import JsonFileSink
 
 # add screen plugins
 from screen.plugin import PluginManager
 
 
+def create_display(args):
+    """create the oled driver, or a headless one with --virtual"""
+    if args.virtual:
+        from drive.virtual import VirtualDisplay
+        return VirtualDisplay(simulate_timing=True, record_dir=args.record)
+
+    # add oled driver
+    from drive import SSD1305
+    return SSD1305.SSD1305()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Muspi Entertainment with AI Agent")
+    parser.add_argument("--virtual", action="store_true", help="run without the oled panel")
+    parser.add_argument("--record", metavar="DIR", help="save virtual display frames as png")
+    parser.add_argument("--profile", metavar="FILE", help="append per-frame timing spans as json lines")
+    args = parser.parse_args()
+
     # init manager
-    manager = DisplayManager(disp=SSD1305.SSD1305())
+    manager = DisplayManager(disp=create_display(args))
+    if args.profile:
+        manager.profiler.add_sink(JsonFileSink(args.profile))
 
     # create plugin manager
     plugin = PluginManager(manager)
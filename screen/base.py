@@ -8,6 +8,13 @@ DEFAULT_FRAME_TIME = 1.0 / 8.0
 class DisplayPlugin(ABC):
     """Base class for display plugins"""
     
+    # Fonts, loaded on first use and shared by every plugin
+    font_status = property(lambda self: FONTS.size_5)
+    font8 = property(lambda self: FONTS.size_8)
+    font10 = property(lambda self: FONTS.size_10)
+    font12 = property(lambda self: FONTS.size_12)
+    font16 = property(lambda self: FONTS.size_16)
+
     def __init__(self, manager, width, height):
         """Initialize the display plugin"""
         # Manager
@@ -22,16 +29,12 @@ class DisplayPlugin(ABC):
         self.image = Image.new('1', (width, height))
         self.draw = ImageDraw.Draw(self.image)
         
-        # Fonts
-        self.font_status = FONTS.size_5
-        self.font8 = FONTS.size_8
-        self.font10 = FONTS.size_10
-        self.font12 = FONTS.size_12
-        self.font16 = FONTS.size_16
-
         
         # Parameters
         self.is_active = False # whether the plugin is active
+        self.redraw_on_demand = False # only redraw after invalidate(), see needs_redraw()
+        self._dirty = True # whether the content changed since the last update
+        self.config = {} # the plugin's "config" entry in config/plugins.json, see configure()
 
         LOGGER.info(f"[\033[1m{self.name}\033[0m] initialized.")
 
@@ -53,10 +56,38 @@ class DisplayPlugin(ABC):
         """check if the plugin should be activated"""
         return self.is_active
     
+    def configure(self, config):
+        """apply the plugin's "config" entry, called by the manager after __init__"""
+        self.config = dict(config or {})
+
     def get_frame_time(self):
         """get the current frame time"""
         return DEFAULT_FRAME_TIME
 
+    def on_sleep(self):
+        """called when the screen turns off, rendering stops until on_wake()"""
+        pass
+
+    def on_wake(self):
+        """called when the screen turns back on"""
+        self.invalidate()
+
+    def invalidate(self):
+        """mark the content as changed, the next frame will call update()"""
+        self._dirty = True
+
+    def validate(self):
+        """called by the manager right before update()"""
+        self._dirty = False
+
+    def needs_redraw(self):
+        """check if the next frame has to be rendered
+
+        plugins with redraw_on_demand can override this to report time
+        based changes without doing a full update()
+        """
+        return self._dirty or not self.redraw_on_demand
+
     def set_active(self, active):
         """set the active state of the plugin"""
         if self.manager.last_active != self and active:
@@ -71,6 +102,8 @@ class DisplayPlugin(ABC):
         if self.manager.last_active == self and not active:
             self.manager.last_active = None
 
+        if active:
+            self.invalidate()
         self.is_active = active
     
     def get_image(self):
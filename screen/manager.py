@@ -1,19 +1,24 @@
 import time
 import sys
 import signal
+import threading
 
 from pathlib import Path
 from PIL import Image, ImageDraw
 from until.device.input import KeyListener, ecodes
 from until.device.volume import adjust_volume, detect_pcm_controls
 from ui.animation import Animation
+from ui.timer import TIMERS
+from ui.timeline import TIMELINE
 from until.log import LOGGER
-from ui.fonts import Fonts
+from ui.fonts import FONTS
+from screen.writer import DisplayWriter
+from screen.profiler import FrameProfiler, span
+from screen.scheduler import FrameScheduler
 
 # contrast value
 CONTRAST = 128
 ANIMATION_DURATION = 0.3
-FONTS = Fonts()
 
 def _show_welcome(
     width, height, msg="Muspi", logo_name="logo.png", logo_size=(24, 24)
@@ -51,7 +56,7 @@ def _show_welcome(
 
 
 class DisplayManager:
-    def __init__(self, disp=None):
+    def __init__(self, disp=None, redraw_on_demand=True):
         """Initialize the display manager"""
         # init display
         if disp is None:
@@ -59,6 +64,18 @@ class DisplayManager:
             sys.exit(1)
 
         self.disp = disp
+        self.profiler = FrameProfiler()
+        self.writer = DisplayWriter(disp, self.profiler)
+        self.scheduler = FrameScheduler()
+
+        # initialize plugins
+        self.plugins = []
+
+        # the panel is off until turn_on_screen()
+        self.sleep = True
+        self.wake_event = threading.Event()
+        # a timer scheduled while the screen is off shortens the wait below
+        TIMERS.on_reschedule = self.wake_event.set
         self.turn_on_screen()
         self.welcome()
 
@@ -71,24 +88,25 @@ class DisplayManager:
         self.anim = Animation(ANIMATION_DURATION)
         self.anim.reset("main_screen")
 
+        # skip frames when nothing changed
+        self.redraw_on_demand = redraw_on_demand
+        self.idle_frames = 0
+
         # init sleep
-        self.sleep = False
         self.sleep_time = 10 * 60  # 10 minutes idle time
-        self.sleep_count = time.time()
-        self.longpress_count = time.time()
+        self.sleep_count = time.monotonic()
+        self.longpress_count = time.monotonic()
         self.longpress_time = 3
 
-        # initialize plugins
-        self.plugins = []
-
         # register signal handler
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
 
-    def add_plugin(self, plugin, auto_hide=False):
+    def add_plugin(self, plugin, auto_hide=False, config=None):
         id = len(self.plugins)
         plugin_instance = plugin(self, self.disp.width, self.disp.height)
         plugin_instance.id = id
+        plugin_instance.configure(config)
 
         plugin = {
             "plugin": plugin_instance,
@@ -128,7 +146,7 @@ class DisplayManager:
 
         if evt.value == 2:
             if evt.code == ecodes.KEY_FORWARD:
-                if time.time() - self.longpress_count > self.longpress_time:
+                if time.monotonic() - self.longpress_count > self.longpress_time:
                     self.turn_off_screen()
 
         if evt.value == 1:  # key down
@@ -137,7 +155,7 @@ class DisplayManager:
             else:
                 if evt.code == ecodes.KEY_FORWARD:
                     self.active_next()
-                    self.longpress_count = time.time()
+                    self.longpress_count = time.monotonic()
                 if evt.code == ecodes.KEY_VOLUMEUP:
                     if hasattr(self.last_active, "adjust_volume"):
                         self.last_active.adjust_volume("up")
@@ -151,29 +169,67 @@ class DisplayManager:
 
     def run(self):
         detect_pcm_controls()
+        self.writer.start()
         self.key_listener.start()
         self.key_listener.on(self.key_callback)
 
         try:
             while True:
-                frame_start = time.time()
-                self.sleep_check()
-
-                for plugin in self.plugins:
-                    plugin["plugin"].event_listener()
+                record = self.profiler.begin(
+                    self.last_active.name if self.last_active else None
+                )
+                with span(record, "sleep_check"):
+                    self.sleep_check()
+
+                with span(record, "event_listener"):
+                    for plugin in self.plugins:
+                        plugin["plugin"].event_listener()
+
+                with span(record, "timers"):
+                    TIMERS.run_due()
+                    TIMELINE.update()
+
+                if self.sleep:
+                    # no rendering and no bus traffic, wait for turn_on_screen() or the next timer
+                    if record is not None:
+                        record.idle = True
+                    self.profiler.end(record)
+                    due = TIMERS.next_due()
+                    self.wake_event.wait(None if due is None else max(0.0, due - time.monotonic()))
+                    # turn_on_screen() clears self.sleep before setting the event, the next pass sees it
+                    self.wake_event.clear()
+                    self.scheduler.reset()
+                    continue
 
                 if self.last_active is None:
                     self.plugins[0]["plugin"].set_active(
                         True
                     )  # set the first plugin as default active
+                    if record is not None:
+                        record.plugin = self.last_active.name
 
                 try:
-                    self.last_active.update()
-                    image = self.last_active.get_image()
+                    # needs_redraw() is plugin code, a failure only costs this frame
+                    if self.is_idle_frame():
+                        # nothing to draw, keep the last frame on the panel
+                        self.idle_frames += 1
+                        if record is not None:
+                            record.idle = True
+                        self.profiler.end(record)
+                        self.scheduler.wait(self.last_active.get_frame_time())
+                        continue
+                    self.force_redraw = False
+
+                    with span(record, "update"):
+                        # validate first: an invalidate() from another thread during update() stays set
+                        self.last_active.validate()
+                        self.last_active.update()
+                        image = self.last_active.get_image()
                     screen_offset = 128
 
-                    if self.last_screen_image is not None:
-                        self.main_screen.paste(self.last_screen_image, (0, 0))
+                    with span(record, "composite"):
+                        if self.last_screen_image is not None:
+                            self.main_screen.paste(self.last_screen_image, (0, 0))
 
                     if self.anim.is_running("main_screen"):
                         screen_offset = round(
@@ -184,9 +240,11 @@ class DisplayManager:
                         frame_time = self.last_active.get_frame_time()
                         self.last_screen_image = None
 
-                    self.main_screen.paste(image, (128 - screen_offset, 0))
-                    self.disp.getbuffer(self.main_screen)
-                    self.disp.ShowImage()
+                    with span(record, "composite"):
+                        self.main_screen.paste(image, (128 - screen_offset, 0))
+                    if record is not None:
+                        record.budget = frame_time
+                    self.writer.submit(self.main_screen, record)
 
                 except Exception as e:
                     import traceback
@@ -195,10 +253,9 @@ class DisplayManager:
                     # if error keep frame
                     LOGGER.error(f"error: {e}")
                     frame_time = 0.1
+                    self.profiler.end(record)
 
-                elapsed = time.time() - frame_start
-                if elapsed < frame_time:
-                    time.sleep(frame_time - elapsed)
+                self.scheduler.wait(frame_time)
 
         except KeyboardInterrupt:
             LOGGER.warning("received keyboard interrupt, cleaning up...")
@@ -209,47 +266,91 @@ class DisplayManager:
         finally:
             self.cleanup(True)
 
+    def is_idle_frame(self):
+        """no invalidation, no animation and no pending transition"""
+        return (
+            self.redraw_on_demand
+            and not self.force_redraw
+            and self.last_screen_image is None
+            and not self.anim.is_running("main_screen")
+            and not self.last_active.needs_redraw()
+        )
+
     def welcome(self):
-        self.disp.getbuffer(
-            _show_welcome(
-                self.disp.width,
-                self.disp.height,
-                msg="Muspi",
-                logo_name="heart.png",
-                logo_size=(24, 24),
+        with self.writer.exclusive() as disp:
+            disp.getbuffer(
+                _show_welcome(
+                    disp.width,
+                    disp.height,
+                    msg="Muspi",
+                    logo_name="heart.png",
+                    logo_size=(24, 24),
+                )
             )
-        )
-        self.disp.ShowImage()
+            disp.ShowImage()
 
     def reset_sleep_timer(self):
-        self.sleep_count = time.time()
+        self.sleep_count = time.monotonic()
 
     def sleep_check(self):
-        if time.time() - self.sleep_count > self.sleep_time:
+        if time.monotonic() - self.sleep_count > self.sleep_time:
             self.turn_off_screen()
 
     def turn_on_screen(self):
         LOGGER.info("\033[1m\033[37mTurn on screen\033[0m")
         self.reset_sleep_timer()
-        self.disp.Init()
-        self.disp.clear()
-        self.disp.set_contrast(CONTRAST)  # 128 is the default contrast value
-        self.disp.set_screen_rotation(1)  # 180 degree rotation
-        self.sleep = False
+        with self.writer.exclusive() as disp:
+            disp.Init()
+            disp.clear()
+            disp.set_contrast(CONTRAST)  # 128 is the default contrast value
+            disp.set_screen_rotation(1)  # 180 degree rotation
+        self.writer.resume()
+        self.force_redraw = True  # panel RAM was cleared
+        if self.sleep:
+            self.sleep = False
+            for plugin in self.plugins:
+                plugin["plugin"].on_wake()
+        self.wake_event.set()
 
     def turn_off_screen(self):
         if not self.sleep:
             LOGGER.info("\033[1m\033[37mTurn off screen\033[0m")
-            # self.cleanup(reset=True)
-            self.disp.command(0xAE)
-            self.disp.reset()
+            self.wake_event.clear()
             self.sleep = True
+            for plugin in self.plugins:
+                plugin["plugin"].on_sleep()
+            # self.cleanup(reset=True)
+            self.writer.pause()
+            with self.writer.exclusive() as disp:
+                disp.command(0xAE)
+                disp.reset()
+
+    def get_frame_stats(self, plugin=None):
+        """span timings of recent frames, for the active plugin by default"""
+        if plugin is None and self.last_active is not None:
+            plugin = self.last_active.name
+        return self.profiler.stats(plugin)
+
+    def get_scheduler_stats(self):
+        """late/skipped frame counters and wake-up jitter"""
+        return self.scheduler.get_stats()
+
+    def get_writer_stats(self):
+        """dropped/coalesced frame counters of the display writer"""
+        return self.writer.get_stats()
+
+    def get_font_stats(self):
+        """fonts loaded so far and the memory they took"""
+        return FONTS.registry.get_stats()
 
     def cleanup(self, reset=True):
-        self.disp.clear()
-        if not reset:
-            self.disp.getbuffer(_show_welcome(self.disp.width, self.disp.height))
-            self.disp.ShowImage()
-        else:
-            self.disp.ShowImage()
-            self.disp.reset()
+        self.writer.stop()
+        self.profiler.close()
+        with self.writer.exclusive() as disp:
+            disp.clear()
+            if not reset:
+                disp.getbuffer(_show_welcome(disp.width, disp.height))
+                disp.ShowImage()
+            else:
+                disp.ShowImage()
+                disp.reset()
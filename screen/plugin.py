@@ -41,7 +41,8 @@ class PluginManager:
                 self.plugin_classes[plugin_info["name"]] = plugin_class
                 
                 # set plugin status
-                self.manager.add_plugin(plugin_class, auto_hide=plugin_info["auto_hide"])
+                self.manager.add_plugin(plugin_class, auto_hide=plugin_info["auto_hide"],
+                                        config=plugin_info.get("config"))
                 
             except Exception as e:
                 LOGGER.error(f"Failed to load plugin {plugin_info['name']}: {e}")
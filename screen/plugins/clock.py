@@ -8,11 +8,23 @@ class clock(DisplayPlugin):
         self.name = "clock"
         super().__init__(manager, width, height)
         self.last_blink_time = 0
+        self.last_second = 0
         self.show_colon = True
+        self.redraw_on_demand = True
+
+    def needs_redraw(self):
+        # the content only changes when the colon blinks or the second ticks
+        current_time = time.time()
+        return (
+            super().needs_redraw()
+            or current_time - self.last_blink_time >= 0.5
+            or int(current_time) != self.last_second
+        )
 
     def update(self):
         self.clear()
         current_time = time.time()
+        self.last_second = int(current_time)
 
         # handle the colon blinking
         if current_time - self.last_blink_time >= 0.5:
@@ -2,6 +2,8 @@ import time
 import random
 from screen.base import DisplayPlugin
 from until.device.input import ecodes
+from ui.glyphs import atlas_for
+from ui.matrix import Matrix
 
 # 游戏参数
 WIDTH = 128
@@ -15,6 +17,7 @@ OBSTACLE_MAX_HEIGHT = 12
 GRAVITY = 0.6 # 稍微增加重力
 JUMP_FORCE = -6 # 稍微增加跳跃力度
 SAFE_DISTANCE = 20  # AI 判断跳跃的安全距离
+JUMP_COOLDOWN = 0.3  # AI 两次跳跃之间的最短时间（秒）
 
 DINO_HEAD1 = [    
     [0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,0],
@@ -116,6 +119,10 @@ CACTUS_SPRITE_6 = [
 ]
 
 GAME_FRAME_TIME = 1.0 / 25.0
+SIM_STEP = 1.0 / 25.0  # 固定的模拟步长，物理参数按这个步长调过
+MAX_SIM_STEPS = 5  # 一帧最多补几步，卡顿太久时宁可变慢也不跳帧
+SCORE_INTERVAL = 0.1  # 每 0.1 秒加一分
+GAME_OVER_TIME = 5  # 游戏结束后多少秒重新开始
 
 def get_dino_sprite(type):
     # 选择头部
@@ -130,6 +137,14 @@ def get_dino_sprite(type):
     sprite.extend(legs)  # 添加腿部
     return sprite
 
+# 精灵图在导入时编译成 1 位图像，绘制时整块贴图
+DINO_SPRITES = {type: Matrix.from_pattern(get_dino_sprite(type)) for type in (1, 2, 3)}
+CACTUS_SPRITES = {
+    12: Matrix.from_pattern(CACTUS_SPRITE_12),
+    9: Matrix.from_pattern(CACTUS_SPRITE_9),
+    6: Matrix.from_pattern(CACTUS_SPRITE_6),
+}
+
 class DinoGame:
     def __init__(self):
         self.x = 10
@@ -166,24 +181,18 @@ class DinoGame:
     def draw(self, draw):
         # 选择当前动画帧
         if self.is_crashed:
-            sprite = get_dino_sprite(3)  # 碰撞状态
+            sprite = DINO_SPRITES[3]  # 碰撞状态
         else:
-            sprite = get_dino_sprite(1 if self.leg_state == 0 else 2)  # 正常奔跑状态
+            sprite = DINO_SPRITES[1 if self.leg_state == 0 else 2]  # 正常奔跑状态
         
         # 绘制恐龙
-        x_start = int(round(self.x))
-        y_start = int(round(self.y))
-        
-        for i in range(DINO_HEIGHT):
-            for j in range(DINO_WIDTH):
-                if sprite[i][j]:
-                    draw.point((x_start + j, y_start + i), fill=255)
+        sprite.draw((int(round(self.x)), int(round(self.y))), draw=draw)
 
 
 class Obstacle:
-    def __init__(self):
+    def __init__(self, rng=random):
         self.x = WIDTH
-        self.height = random.randint(OBSTACLE_MIN_HEIGHT, OBSTACLE_MAX_HEIGHT)
+        self.height = rng.randint(OBSTACLE_MIN_HEIGHT, OBSTACLE_MAX_HEIGHT)
         # 根据高度选择最接近的仙人掌图案
         if self.height >= 11:
             self.height = 12
@@ -194,6 +203,7 @@ class Obstacle:
         else:
             self.height = 6
             self.sprite = CACTUS_SPRITE_6
+        self.mask = CACTUS_SPRITES[self.height]
         self.y = GROUND_Y - self.height
         self.width = OBSTACLE_WIDTH
         self.speed = 3
@@ -204,34 +214,34 @@ class Obstacle:
 
     def draw(self, draw):
         # 绘制仙人掌
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.sprite[i][j]:
-                    draw.point((int(self.x) + j, int(self.y) + i), fill=255)
+        self.mask.draw((int(self.x), int(self.y)), draw=draw)
 
-# 恐龙游戏显示类
-class dino(DisplayPlugin):
-    def __init__(self, manager, width, height):
-        self.name = "dino"
-        super().__init__(manager, width, height)
-        self.frame_time = 1.0 / 30.0  # 30fps = 33.33ms 每帧
-        self.reset_game()
-        
-    def reset_game(self, player="AI"):
+
+class DinoSimulation:
+    """one game advanced in fixed SIM_STEP ticks, independent of rendering
+
+    Everything that used to read time.time() runs on the simulated clock and
+    all randomness comes from rng, so the same seed replays the same game.
+    Headless callers can step() it as fast as they like.
+    """
+
+    def __init__(self, player="AI", seed=None, safe_distance=SAFE_DISTANCE, jump_cooldown=JUMP_COOLDOWN):
+        self.rng = random.Random(seed)
+        self.player = player
+        self.safe_distance = safe_distance
+        self.jump_cooldown = jump_cooldown
         self.dino = DinoGame()
         self.obstacles = []
         self.score = 0
         self.game_over = False
-        self.last_jump_time = 0
-        self.jump_cooldown = 0.3
-        self.frame_count = 0
-        self.last_score_update = time.time()
+        self.time = 0.0  # 模拟时间，每步增加 SIM_STEP
+        self.steps = 0
+        self.last_jump_time = -jump_cooldown
+        self.last_score_update = 0.0
         self.game_over_time = 0  # 记录游戏结束的时间
-        self.player = player
 
     def ai_decision(self):
-        current_time = time.time()
-        if current_time - self.last_jump_time < self.jump_cooldown:
+        if self.time - self.last_jump_time < self.jump_cooldown:
             return
 
         # 找到最近的障碍物
@@ -245,14 +255,14 @@ class dino(DisplayPlugin):
                 nearest_obstacle = obstacle
 
         # 如果障碍物在安全距离内且恐龙在地面上，就跳跃
-        if nearest_obstacle and min_distance < SAFE_DISTANCE and not self.dino.is_jumping:
+        if nearest_obstacle and min_distance < self.safe_distance and not self.dino.is_jumping:
             self.dino.jump()
-            self.last_jump_time = current_time
+            self.last_jump_time = self.time
 
     def spawn_obstacle(self):
         # 根据帧数调整障碍物生成
-        if random.random() < 0.03 and (not self.obstacles or self.obstacles[-1].x < WIDTH - 50):  # 将最小距离从40增加到50
-            self.obstacles.append(Obstacle())
+        if self.rng.random() < 0.03 and (not self.obstacles or self.obstacles[-1].x < WIDTH - 50):  # 将最小距离从40增加到50
+            self.obstacles.append(Obstacle(self.rng))
 
     def check_collision(self):
         dino_rect = (self.dino.x, self.dino.y, 
@@ -269,20 +279,16 @@ class dino(DisplayPlugin):
                 return True
         return False
 
-    def update_object(self):
-        current_time = time.time()
-        
-        # 如果游戏结束且已经过去5秒，重新开始游戏
+    def step(self):
+        """advance the game by one SIM_STEP"""
+        self.time += SIM_STEP
         if self.game_over:
-            if current_time - self.game_over_time >= 5:
-                self.reset_game()
             return
+        self.steps += 1
 
-        self.frame_count += 1
-        
-        if current_time - self.last_score_update >= 0.1:
+        if self.time - self.last_score_update >= SCORE_INTERVAL:
             self.score += 1
-            self.last_score_update = current_time
+            self.last_score_update = self.time
 
         self.dino.update()
         self.spawn_obstacle()
@@ -297,7 +303,58 @@ class dino(DisplayPlugin):
         # 检查碰撞
         if self.check_collision():
             self.game_over = True
-            self.game_over_time = current_time  # 记录游戏结束时间
+            self.game_over_time = self.time  # 记录游戏结束时间
+
+    def run(self, max_steps):
+        """step until the dino crashes or max_steps, returns the steps survived"""
+        while not self.game_over and self.steps < max_steps:
+            self.step()
+        return self.steps
+
+
+# 恐龙游戏显示类
+class dino(DisplayPlugin):
+    def __init__(self, manager, width, height):
+        self.name = "dino"
+        super().__init__(manager, width, height)
+        self.frame_time = 1.0 / 30.0  # 30fps = 33.33ms 每帧
+        self.glyphs = atlas_for(self.font8)  # 分数和提示文字用缓存的字形绘制
+        self.clock = time.perf_counter  # 推进模拟用的时钟，基准测试可以换成模拟时钟
+        self.reset_game()
+        
+    def reset_game(self, player="AI"):
+        # AI 参数可以在 config/plugins.json 里调整，见 benchmark/dino_ai.py
+        self.game = DinoSimulation(
+            player,
+            safe_distance=self.config.get("safe_distance", SAFE_DISTANCE),
+            jump_cooldown=self.config.get("jump_cooldown", JUMP_COOLDOWN),
+        )
+        self.accumulator = 0.0  # 还没模拟的真实时间
+        self.last_tick = self.clock()
+
+    def configure(self, config):
+        super().configure(config)
+        self.reset_game()
+
+    # 绘制和按键处理用到的游戏状态
+    dino = property(lambda self: self.game.dino)
+    obstacles = property(lambda self: self.game.obstacles)
+    score = property(lambda self: self.game.score)
+    game_over = property(lambda self: self.game.game_over)
+    player = property(lambda self: self.game.player)
+
+    def update_object(self):
+        # 按真实经过的时间推进固定步长的模拟，渲染慢时一帧补几步
+        now = self.clock()
+        self.accumulator += min(now - self.last_tick, SIM_STEP * MAX_SIM_STEPS)
+        self.last_tick = now
+        while self.accumulator >= SIM_STEP:
+            self.game.step()
+            self.accumulator -= SIM_STEP
+
+        # 如果游戏结束且已经过去5秒，重新开始游戏
+        if self.game.game_over and self.game.time - self.game.game_over_time >= GAME_OVER_TIME:
+            self.reset_game()
 
     def draw_game(self):
         self.draw.rectangle((0, 0, WIDTH, HEIGHT), fill=0)
@@ -315,25 +372,25 @@ class dino(DisplayPlugin):
         if self.player != "AI":
             # 绘制分数（右对齐）
             score_text = str(self.score)
-            score_bbox = self.draw.textbbox((0, 0), score_text, font=self.font8)
+            score_bbox = self.glyphs.getbbox(score_text)
             score_width = score_bbox[2] - score_bbox[0]
-            self.draw.text((WIDTH - score_width - 4, 2), score_text, fill=255, font=self.font8)
+            self.glyphs.draw(self.image, (WIDTH - score_width - 4, 2), score_text)
         
         if self.player == "AI":
             # 计算 GAME OVER 文本的边界框
             game_over_text = "press to start"
-            text_bbox = self.draw.textbbox((0, 0), game_over_text, font=self.font8)
+            text_bbox = self.glyphs.getbbox(game_over_text)
             text_width = text_bbox[2] - text_bbox[0]
             text_height = text_bbox[3] - text_bbox[1]
             # 绘制黑色文本
             text_x = WIDTH//2 - text_width//2+8
             text_y = HEIGHT//2 - text_height//2-4
-            self.draw.text((text_x, text_y), game_over_text, fill=255, font=self.font8)
+            self.glyphs.draw(self.image, (text_x, text_y), game_over_text)
             
         if self.game_over:
             # 计算 GAME OVER 文本的边界框
             game_over_text = "GAME OVER"
-            text_bbox = self.draw.textbbox((0, 0), game_over_text, font=self.font8)
+            text_bbox = self.glyphs.getbbox(game_over_text)
             text_width = text_bbox[2] - text_bbox[0]
             text_height = text_bbox[3] - text_bbox[1]
             
@@ -348,13 +405,13 @@ class dino(DisplayPlugin):
             # 绘制黑色文本
             text_x = WIDTH//2 - text_width//2 + 4
             text_y = HEIGHT//2 - text_height//2 - 8
-            self.draw.text((text_x, text_y), game_over_text, fill=255, font=self.font8)
+            self.glyphs.draw(self.image, (text_x, text_y), game_over_text)
             
             # 显示重启倒计时
-            remaining = 5 - int(time.time() - self.game_over_time)
+            remaining = GAME_OVER_TIME - int(self.game.time - self.game.game_over_time)
             if remaining > 0:
                 self.draw.rectangle((WIDTH//2-1, HEIGHT//2+2, WIDTH//2+10, HEIGHT//2+10), fill=0)
-                self.draw.text((WIDTH//2+1, HEIGHT//2), f"{remaining}s", fill=255, font=self.font8)
+                self.glyphs.draw(self.image, (WIDTH//2+1, HEIGHT//2), f"{remaining}s")
                 
     def update(self):
         self.clear()
@@ -364,6 +421,12 @@ class dino(DisplayPlugin):
     def get_frame_time(self):
         return GAME_FRAME_TIME
 
+    def on_wake(self):
+        super().on_wake()
+        # the game was frozen while the screen was off, start a fresh one
+        if self.is_active:
+            self.reset_game()
+
     def key_callback(self, device_name, evt):
         if evt.value == 1:  # key down
             if evt.code == ecodes.KEY_KP1 or evt.code == ecodes.KEY_KP2:
@@ -1,69 +1,156 @@
-import random
+import time
+from collections import deque
+import numpy as np
+from PIL import Image
 from screen.base import DisplayPlugin
 from until.device.input import ecodes
+from until.log import LOGGER
 
 GAME_FRAME_TIME = 1 / 30
+CELL_SIZE = 2  # 每个细胞在屏幕上的像素大小
+BOARD_SCALE = 1  # 虚拟棋盘是屏幕网格的几倍，大于 1 时屏幕只显示其中一块
+VIEWPORT_DRIFT = (0, 0)  # 每代视口移动的细胞数 (x, y)，用来浏览大棋盘
+CYCLE_MAX_PERIOD = 60  # 检测的最长振荡周期，1 为静止
+CYCLE_ACTION = "reseed"  # 进入循环后："reseed" 重新播种，"slow" 降低帧率
+CYCLE_HOLD = 30  # 进入循环后再显示多少代才重新播种
+IDLE_FRAME_TIME = 1 / 4  # "slow" 时的帧间隔
+
+
+class LifeBoard:
+    """toroidal Game of Life board on a numpy array
+
+    A generation is a handful of whole-array operations: the neighbour
+    count is the sum of the board rolled by one cell in each direction, so
+    the edges wrap around. The hashes of the last max_period generations
+    are kept so still lifes and oscillators show up as a repeated hash.
+    """
+
+    def __init__(self, width, height, rng=None, max_period=CYCLE_MAX_PERIOD):
+        self.width = width
+        self.height = height
+        self.rng = rng or np.random.default_rng()
+        self.cells = np.zeros((height, width), dtype=np.uint8)
+        self.generation = 0
+        self.period = None  # 检测到的循环周期，None 表示还在变化
+        self._history = deque(maxlen=max_period)
+
+    def _hash(self):
+        return hash(np.packbits(self.cells).tobytes())
+
+    def seed(self, density=0.5):
+        """随机初始化棋盘"""
+        self.cells = (self.rng.random((self.height, self.width)) < density).astype(np.uint8)
+        self.generation = 0
+        self.period = None
+        self._history.clear()
+        self._history.append(self._hash())
+
+    def step(self):
+        """advance one generation"""
+        cells = self.cells
+        # 先按行再按列累加，8 个邻居只需要 4 次 roll
+        rows = cells + np.roll(cells, 1, axis=0) + np.roll(cells, -1, axis=0)
+        neighbors = rows + np.roll(rows, 1, axis=1) + np.roll(rows, -1, axis=1) - cells
+        self.cells = ((neighbors == 3) | ((cells == 1) & (neighbors == 2))).astype(np.uint8)
+        self.generation += 1
+
+        # 和最近几代比较，重复出现说明进入了静止或振荡
+        key = self._hash()
+        if self.period is None:
+            for distance, seen in enumerate(reversed(self._history), 1):
+                if seen == key:
+                    self.period = distance
+                    break
+        self._history.append(key)
+
+    def view(self, x, y, width, height):
+        """a width x height window at (x, y), wrapping around the edges"""
+        if (x, y, width, height) == (0, 0, self.width, self.height):
+            return self.cells
+        rows = np.arange(y, y + height) % self.height
+        cols = np.arange(x, x + width) % self.width
+        return self.cells[np.ix_(rows, cols)]
+
 
 class life(DisplayPlugin):
     def __init__(self, manager, width, height):
         self.name = "life"
         super().__init__(manager, width, height)
-        self.cell_size = 2
+        self.cell_size = CELL_SIZE
         self.grid_width = self.width // self.cell_size
         self.grid_height = self.height // self.cell_size
-        self.grid = [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)]
+        self.board = LifeBoard(self.grid_width * BOARD_SCALE, self.grid_height * BOARD_SCALE)
+        self.viewport = [0, 0]  # 屏幕左上角在棋盘上的位置
+        self.cycle_generations = 0  # 进入循环后经过的代数
+
+        # 统计
+        self.generations = 0
+        self.reseeds = 0
+        self.cycles = 0
+        self.step_time = 0.0
+        self.started = time.perf_counter()
         self.initialize_grid()
-        
+
+    @property
+    def grid(self):
+        """当前屏幕上的网格"""
+        return self.board.view(self.viewport[0], self.viewport[1], self.grid_width, self.grid_height)
+
     def initialize_grid(self):
         # 随机初始化网格
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                self.grid[y][x] = random.randint(0, 1)
-                
-    def count_neighbors(self, x, y):
-        count = 0
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx = (x + dx) % self.grid_width
-                ny = (y + dy) % self.grid_height
-                count += self.grid[ny][nx]
-        return count
-    
+        self.board.seed()
+        self.cycle_generations = 0
+
     def update(self):
-        # 清空画布
-        self.clear()
-        
         # 更新网格状态
-        new_grid = [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)]
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                neighbors = self.count_neighbors(x, y)
-                if self.grid[y][x] == 1:
-                    if neighbors < 2 or neighbors > 3:
-                        new_grid[y][x] = 0
-                    else:
-                        new_grid[y][x] = 1
-                else:
-                    if neighbors == 3:
-                        new_grid[y][x] = 1
-        self.grid = new_grid
-        
-        # 绘制当前状态
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                if self.grid[y][x] == 1:
-                    self.draw.rectangle([
-                        x * self.cell_size,
-                        y * self.cell_size,
-                        (x + 1) * self.cell_size - 1,
-                        (y + 1) * self.cell_size - 1
-                    ], fill=1)
-        
+        start = time.perf_counter()
+        self.board.step()
+        self.step_time += time.perf_counter() - start
+        self.generations += 1
+        self._check_cycle()
+        self.viewport[0] = (self.viewport[0] + VIEWPORT_DRIFT[0]) % self.board.width
+        self.viewport[1] = (self.viewport[1] + VIEWPORT_DRIFT[1]) % self.board.height
+
+        # 绘制当前状态：网格转成图像后整体放大，不再逐个画方块
+        cells = Image.fromarray(self.grid.astype(bool))
+        if self.cell_size != 1:
+            cells = cells.resize(
+                (self.grid_width * self.cell_size, self.grid_height * self.cell_size),
+                Image.NEAREST,
+            )
+        self.clear()
+        self.image.paste(cells, (0, 0))
+
+    def _check_cycle(self):
+        """进入静止或振荡后重新播种，或者交给 get_frame_time 降低帧率"""
+        if self.board.period is None:
+            return
+        if self.cycle_generations == 0:
+            self.cycles += 1
+            LOGGER.debug(f"[life] period {self.board.period} after {self.board.generation} generations")
+        self.cycle_generations += 1
+        if CYCLE_ACTION == "reseed" and self.cycle_generations >= CYCLE_HOLD:
+            self.reseeds += 1
+            self.initialize_grid()
+
     def get_frame_time(self):
+        if CYCLE_ACTION == "slow" and self.board.period is not None:
+            return IDLE_FRAME_TIME
         return GAME_FRAME_TIME
-    
+
+    def get_stats(self):
+        """generation counters and throughput"""
+        elapsed = time.perf_counter() - self.started
+        return {
+            "generation": self.board.generation,
+            "period": self.board.period,
+            "generations": self.generations,
+            "cycles": self.cycles,
+            "reseeds": self.reseeds,
+            "generations_per_second": self.generations / elapsed if elapsed else 0.0,
+            "step_us": self.step_time / self.generations * 1e6 if self.generations else 0.0,
+        }
+
     def set_active(self, active):
         super().set_active(active)
         if active:
@@ -71,7 +158,7 @@ class life(DisplayPlugin):
             self.manager.key_listener.on(self.key_callback)
         else:
             self.manager.key_listener.off(self.key_callback)
-    
+
     def key_callback(self, device_name, evt):
         if evt.value == 1:  # key down
             if evt.code == ecodes.KEY_KP1 or evt.code == ecodes.KEY_KP2:
@@ -15,11 +15,14 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from screen.base import DisplayPlugin
 from until.device.input import ecodes
+from until.device.volume import adjust_volume
 from until.log import LOGGER
 
 from ui.emotion import RobotEmotion
 from ui.textarea import TextArea
-from ui.animation import Animation,Operator
+from ui.animation import Operator
+from ui.timer import TIMERS
+from ui.timeline import TIMELINE, Track
 
 
 OTA_VERSION_URL = 'https://api.tenclass.net/xiaozhi/ota/'
@@ -38,6 +41,7 @@ EMOTION_FRAME_TIME = 1.0 / 45.0
 SLEEP_TIMEOUT = 3 * 60 # 3 minutes for sleep
 CHATBOX_WIDTH = 62 # 聊天框宽度
 ROBOT_OFFSET_X = 34
+CHATBOX_SLIDE_TIME = 0.3 # 聊天框滑动时间（秒）
 
 AUTO_CHATBOX = False
 
@@ -104,15 +108,16 @@ class xiaozhi(DisplayPlugin):
         # 动画相关属性
         self.robot_offset_x = 0
         self.chatbox_offset_x = 0
+        self.chatbox_target = (0, 0)  # 滑动结束时的 (robot_offset_x, chatbox_offset_x)
         
-        self.animations = {}  # 存储所有动画状态
-        self.anim = Animation(0.3)
+        self.timeline = TIMELINE
         
         self.sleep_time = time.time()
         self.is_sleeping = False
         
         self.robot = RobotEmotion()
         self.text_area = TextArea(font=self.font8,width=CHATBOX_WIDTH,line_spacing=4)
+        self.redraw_on_demand = True
 
         # init audio & mqtt
         # self.audio = pyaudio.PyAudio()
@@ -154,10 +159,7 @@ class xiaozhi(DisplayPlugin):
         self.text_area.append_text("你好.")
         self.text_area.append_text("我是小派.")
         self.text_area.append_text("---")
-        threading.Timer(
-            3,
-            lambda: self._close_chatbox()
-        ).start()
+        self._close_chatbox(delay=3)
 
     def _on_connect(self, client, userdata, flags, rs, pr):
         LOGGER.info(f"connect to mqtt server at {self.mqtt_info['endpoint']}")
@@ -424,21 +426,45 @@ class xiaozhi(DisplayPlugin):
             spk.wait()
             
 
+    def adjust_volume(self, direction):
+        # 聊天框打开时音量键用来翻看历史消息
+        if self.chatbox_target == (0, 0):
+            adjust_volume(direction)
+        elif direction == "up":
+            self.text_area.page_up()
+        else:
+            self.text_area.page_down()
+
     def switch_chatbox(self):
         if self.chatbox_offset_x == 0:
             self._open_chatbox()
         else:
             self._close_chatbox()
     
-    #def start(self, id, obj, attr, target, duration=None):
+    def _slide_chatbox(self, robot_x, chatbox_x, delay=0):
+        # 机器人和聊天框一起滑动
+        self.chatbox_target = (robot_x, chatbox_x)
+        slide = Track(self, [(CHATBOX_SLIDE_TIME, {"robot_offset_x": robot_x, "chatbox_offset_x": chatbox_x})],
+                      operator=Operator.ease_out_bounce, delay=delay)
+        self.timeline.play(slide, name=(self, "chatbox"), on_complete=self.invalidate)
+
     def _open_chatbox(self):
-        self.anim.start('robot_offset_x',obj=self,attr='robot_offset_x',target=-ROBOT_OFFSET_X,operator=Operator.ease_out_bounce)
-        self.anim.start('chatbox_offset_x',obj=self,attr='chatbox_offset_x',target=-CHATBOX_WIDTH,operator=Operator.ease_out_bounce)
+        self._slide_chatbox(-ROBOT_OFFSET_X, -CHATBOX_WIDTH)
             
-    def _close_chatbox(self):
-        self.anim.start('robot_offset_x',obj=self,attr='robot_offset_x',target=0,operator=Operator.ease_out_bounce)
-        self.anim.start('chatbox_offset_x',obj=self,attr='chatbox_offset_x',target=0,operator=Operator.ease_out_bounce)
+    def _close_chatbox(self, delay=0):
+        self.text_area.scroll_to_latest()
+        self._slide_chatbox(0, 0, delay=delay)
    
+    def needs_redraw(self):
+        # idle face: no emotion change, no tween, no new text and not falling asleep
+        return (
+            super().needs_redraw()
+            or self.robot.needs_redraw()
+            or self.text_area.needs_redraw()
+            or self.timeline.is_playing((self, "chatbox"))
+            or (not self.is_sleeping and time.time() - self.sleep_time > SLEEP_TIMEOUT)
+        )
+
     def update(self):
         self.clear()
         current_time = time.time()
@@ -446,9 +472,6 @@ class xiaozhi(DisplayPlugin):
         if current_time - self.sleep_time > SLEEP_TIMEOUT:
             self._sleep()
         
-        # 更新所有动画
-        self.anim.update()
-        
         robot = self.robot.update()
         # 计算居中位置
         x = (self.width - robot.width) // 2 + self.robot_offset_x
@@ -460,6 +483,20 @@ class xiaozhi(DisplayPlugin):
         y = (self.height - chatbox.height) // 2
         self.draw.bitmap((x, y), chatbox, fill=255)
         
+    def on_sleep(self):
+        # 屏幕关闭时停掉所有定时器和动画，不在后台继续跑
+        if TIMERS.has_group((self, "wakeup")):
+            TIMERS.cancel_group((self, "wakeup"))
+            self.robot.set_emotion("neutral")
+        # 滑动中的聊天框直接停在终点
+        self.timeline.stop((self, "chatbox"))
+        self.robot_offset_x, self.chatbox_offset_x = self.chatbox_target
+        self.robot.pause()
+
+    def on_wake(self):
+        super().on_wake()
+        self.robot.resume()
+
     def _wakeup(self):
         if self.is_sleeping:
             self.sleep_time = time.time() #reset sleep time
@@ -467,10 +504,8 @@ class xiaozhi(DisplayPlugin):
             self.robot.set_emotion("angry")
             
             # 设置表情切换计时器
-            threading.Timer(
-                3,
-                lambda: self.robot.set_emotion("neutral")
-            ).start()
+            TIMERS.cancel_group((self, "wakeup"))
+            TIMERS.schedule(3, lambda: self.robot.set_emotion("neutral"), group=(self, "wakeup"))
             
         
     def _sleep(self):
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from until.log import LOGGER
+
+RING_SIZE = 512  # frames kept for runtime queries
+
+
+class FrameRecord:
+    """timing spans of one frame, filled by the render loop and the writer"""
+
+    __slots__ = ("plugin", "start", "budget", "spans", "coalesced", "idle", "dropped")
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.start = time.monotonic()
+        self.budget = 0.0
+        self.spans = {}
+        self.coalesced = False
+        self.idle = False  # nothing was rendered (idle frame or screen off)
+        self.dropped = False  # rendered but never reached the panel
+
+    @contextmanager
+    def span(self, name):
+        """time the block and store it as a span, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self):
+        return {
+            "plugin": self.plugin,
+            "start": self.start,
+            "budget_ms": self.budget * 1e3,
+            "spans_ms": {name: value * 1e3 for name, value in self.spans.items()},
+            "total_ms": sum(self.spans.values()) * 1e3,
+            "late": self.is_late(),
+            "coalesced": self.coalesced,
+            "idle": self.idle,
+            "dropped": self.dropped,
+        }
+
+    def is_late(self):
+        return self.budget > 0 and sum(self.spans.values()) > self.budget
+
+
+class RingBufferSink:
+    """keep the last frames in memory"""
+
+    def __init__(self, size=RING_SIZE):
+        self.frames = deque(maxlen=size)
+
+    def emit(self, record):
+        self.frames.append(record)
+
+    def query(self, plugin=None):
+        return [record for record in list(self.frames) if plugin is None or record.plugin == plugin]
+
+
+class LogSink:
+    """log a line per frame, or only for frames over their budget"""
+
+    def __init__(self, level=logging.DEBUG, only_late=True):
+        self.level = level
+        self.only_late = only_late
+
+    def emit(self, record):
+        if self.only_late and not record.is_late():
+            return
+        spans = " ".join(f"{name}={value * 1e3:.2f}" for name, value in record.spans.items())
+        LOGGER.log(
+            self.level,
+            f"[{record.plugin}] frame {sum(record.spans.values()) * 1e3:.2f}/{record.budget * 1e3:.2f}ms {spans}",
+        )
+
+
+class JsonFileSink:
+    """append one json object per frame to a file"""
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+        self.lock = threading.Lock()
+
+    def emit(self, record):
+        with self.lock:
+            self.file.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class FrameProfiler:
+    """collect per-frame spans and hand finished frames to the sinks"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.ring = RingBufferSink()
+        self.sinks = [self.ring]
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def begin(self, plugin):
+        """start a frame record, None when profiling is off"""
+        if not self.enabled:
+            return None
+        return FrameRecord(plugin)
+
+    def end(self, record):
+        """finish a frame record and emit it"""
+        if record is None:
+            return
+        for sink in self.sinks:
+            try:
+                sink.emit(record)
+            except Exception as e:
+                LOGGER.error(f"profiler sink {type(sink).__name__} error: {e}")
+
+    def stats(self, plugin=None):
+        """p50/p95/max per span over the frames in the ring buffer"""
+        records = self.ring.query(plugin)
+        spans = {}
+        for record in records:
+            for name, value in record.spans.items():
+                spans.setdefault(name, []).append(value)
+        result = {
+            "frames": len(records),
+            "late": sum(1 for record in records if record.is_late()),
+            "idle": sum(1 for record in records if record.idle),
+            "dropped": sum(1 for record in records if record.dropped),
+            "spans_ms": {},
+        }
+        for name, values in spans.items():
+            values.sort()
+            result["spans_ms"][name] = {
+                "p50": values[len(values) // 2] * 1e3,
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))] * 1e3,
+                "max": values[-1] * 1e3,
+            }
+        return result
+
+    def close(self):
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+
+@contextmanager
+def span(record, name):
+    """record.span(name), or nothing when record is None"""
+    if record is None:
+        yield
+    else:
+        with record.span(name):
+            yield
@@ -0,0 +1,70 @@
+import time
+from collections import deque
+
+JITTER_SAMPLES = 256
+
+
+class FrameScheduler:
+    """fixed-rate frame deadlines on time.monotonic()
+
+    Each frame is due one frame time after the previous deadline, not after
+    the previous frame finished, so small overruns do not accumulate. When
+    the loop falls a whole frame or more behind, the missed deadlines are
+    skipped instead of rendered back to back.
+    """
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.deadline = None
+
+        # statistics
+        self.frames = 0
+        self.late = 0  # frames that finished after their deadline
+        self.skipped = 0  # deadlines dropped under overload
+        self.jitter = deque(maxlen=JITTER_SAMPLES)  # wake time - deadline
+
+    def reset(self):
+        """start a new timeline from now"""
+        self.deadline = None
+
+    def wait(self, frame_time):
+        """sleep until the next deadline, return the number of skipped frames"""
+        now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+        self.deadline += frame_time
+        self.frames += 1
+
+        skipped = 0
+        if now > self.deadline:
+            self.late += 1
+            if frame_time > 0:
+                skipped = int((now - self.deadline) // frame_time)
+            if skipped:
+                self.skipped += skipped
+                self.deadline += skipped * frame_time
+            else:
+                # less than one frame behind, start the next one right away
+                self.jitter.append(now - self.deadline)
+                return 0
+
+        self.sleep(max(0.0, self.deadline - now))
+        self.jitter.append(self.clock() - self.deadline)
+        return skipped
+
+    def get_stats(self):
+        """frame counters and wake-up jitter in milliseconds"""
+        jitter = sorted(self.jitter)
+        if jitter:
+            p50 = jitter[len(jitter) // 2] * 1e3
+            p95 = jitter[min(len(jitter) - 1, int(len(jitter) * 0.95))] * 1e3
+            worst = jitter[-1] * 1e3
+        else:
+            p50 = p95 = worst = 0.0
+        return {
+            "frames": self.frames,
+            "late": self.late,
+            "skipped": self.skipped,
+            "jitter_ms": {"p50": p50, "p95": p95, "max": worst},
+        }
@@ -0,0 +1,129 @@
+import threading
+from contextlib import contextmanager
+
+from until.log import LOGGER
+from screen.profiler import span
+
+
+class DisplayWriter(threading.Thread):
+    """push frames to the display on its own thread
+
+    The render loop submits a copy of each composed frame (the back buffer)
+    and returns at once. The writer packs and transfers it (the front
+    buffer) while the next frame is rendered. If a frame is still waiting
+    when a newer one arrives, the newer one replaces it.
+    """
+
+    def __init__(self, disp, profiler=None):
+        super().__init__(name="DisplayWriter")
+        self.daemon = True  # set as daemon thread, exit when main program exits
+        self.disp = disp
+        self.profiler = profiler
+        self.running = True
+        self.paused = False  # drop submitted frames, the panel is off
+        self.lock = threading.RLock()  # held while the bus is in use
+        self._cond = threading.Condition()
+        self._back = None  # pending frame
+        self._back_record = None  # its profiler record
+
+        # statistics
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0  # pending frames replaced by a newer one
+        self.dropped = 0  # frames discarded or failed to write
+
+    def submit(self, image, record=None):
+        """hand off a frame, never blocks on the bus"""
+        if self.paused:
+            self.dropped += 1
+            self._drop_record(record)
+            return
+        frame = image.copy()
+        with self._cond:
+            replaced = self._back_record if self._back is not None else None
+            if self._back is not None:
+                self.coalesced += 1
+            self._back = frame
+            self._back_record = record
+            self.submitted += 1
+            self._cond.notify()
+        if replaced is not None:
+            replaced.coalesced = True
+            self._end_record(replaced)
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self.running and self._back is None:
+                    self._cond.wait()
+                if not self.running:
+                    break
+                front, self._back = self._back, None
+                record, self._back_record = self._back_record, None
+
+            with self.lock:
+                try:
+                    with span(record, "getbuffer"):
+                        self.disp.getbuffer(front)
+                    with span(record, "ShowImage"):
+                        self.disp.ShowImage()
+                    self.written += 1
+                except Exception as e:
+                    self.dropped += 1
+                    if record is not None:
+                        record.dropped = True
+                    LOGGER.error(f"display write error: {e}")
+            self._end_record(record)
+
+    def _end_record(self, record):
+        if record is not None and self.profiler is not None:
+            self.profiler.end(record)
+
+    def _drop_record(self, record):
+        if record is not None:
+            record.dropped = True
+            self._end_record(record)
+
+    def discard(self):
+        """drop the pending frame, if any"""
+        record = None
+        with self._cond:
+            if self._back is not None:
+                record = self._back_record
+                self._back = None
+                self._back_record = None
+                self.dropped += 1
+        self._drop_record(record)
+
+    def pause(self):
+        """drop frames until resume()"""
+        self.paused = True
+        self.discard()
+
+    def resume(self):
+        self.paused = False
+
+    @contextmanager
+    def exclusive(self):
+        """direct access to the display, waits for the frame in flight"""
+        self.discard()
+        with self.lock:
+            yield self.disp
+
+    def stop(self, timeout=1.0):
+        """stop the thread, the pending frame is discarded"""
+        self.discard()
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+    def get_stats(self):
+        """frame counters"""
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
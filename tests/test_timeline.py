@@ -0,0 +1,49 @@
+import pytest
+
+from ui.animation import Operator
+from ui.timeline import Timeline, Track, Node
+
+
+class Chatbox:
+    """stands in for a redraw-on-demand plugin sliding its chatbox"""
+
+    def __init__(self):
+        self.chatbox_offset_x = 0
+        self.drawn = []
+
+
+def run_frames(timeline, box, name, frames, frame_time):
+    """the manager loop: advance the timeline, draw only while it is playing"""
+    for frame in range(1, frames + 1):
+        timeline.update(frame * frame_time)
+        if timeline.is_playing(name):
+            box.drawn.append(box.chatbox_offset_x)
+
+
+def test_last_keyframe_is_drawn():
+    timeline = Timeline(clock=lambda: 0.0)
+    box = Chatbox()
+    slide = Track(box, [(0.3, {"chatbox_offset_x": -62})], operator=Operator.ease_out_bounce)
+    timeline.play(slide, name="chatbox")
+
+    run_frames(timeline, box, "chatbox", frames=20, frame_time=1 / 30)
+
+    assert box.chatbox_offset_x == -62
+    assert box.drawn[-1] == -62
+    assert not timeline.is_playing("chatbox")
+
+
+def test_finished_playback_is_dropped_after_one_frame():
+    timeline = Timeline(clock=lambda: 0.0)
+    box = Chatbox()
+    timeline.play(Track(box, [(0.1, {"chatbox_offset_x": -10})]), name="chatbox")
+
+    timeline.update(0.1)
+    assert timeline.is_playing("chatbox")
+    timeline.update(0.2)
+    assert not timeline.is_playing("chatbox")
+
+
+def test_node_is_abstract():
+    with pytest.raises(TypeError):
+        Node()
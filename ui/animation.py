@@ -1,5 +1,9 @@
 import time
 import math
+import numpy as np
+from ui.timer import TIMERS
+
+LUT_SIZE = 256  # 缓动表采样点数
 
 class Animation:
     def __init__(self,duration=0.3):
@@ -16,7 +20,7 @@ class Animation:
             "current": current,
             "target": 0,
             "duration": self.default_duration,
-            "start_time": time.time(),
+            "start_time": time.monotonic(),
             "obj": None,  # 存储对象引用
             "attr": None  # 存储属性名
         }
@@ -35,7 +39,7 @@ class Animation:
                 # 设置新值
                 setattr(anim["obj"], anim["attr"], result)
     
-    def start(self, id, obj, attr, target, duration=None, operator=None):
+    def start(self, id, obj, attr, target, duration=None, operator=None, delay=0):
         '''
         开始动画
         id: 动画id
@@ -43,7 +47,18 @@ class Animation:
         attr: 要动画的属性名
         target: 目标值
         duration: 动画时长
+        delay: 延迟开始的秒数，通过共享定时器队列调度
         '''
+        # a new start replaces a pending delayed one
+        TIMERS.cancel_group((self, id))
+        if delay > 0:
+            TIMERS.schedule(
+                delay,
+                lambda: self.start(id, obj, attr, target, duration, operator),
+                group=(self, id),
+            )
+            return
+
         self.reset(id)
         anim = self.animation_list[id]
         anim["obj"] = obj
@@ -64,7 +79,7 @@ class Animation:
             duration = self.default_duration
         
         if self.animation_list[id]["start_time"] > 0:
-            elapsed = time.time() - self.animation_list[id]["start_time"]
+            elapsed = time.monotonic() - self.animation_list[id]["start_time"]
             if elapsed <= duration:
                 current = self.animation_list[id]["current"]
                 progress = elapsed / duration
@@ -170,8 +185,52 @@ class Operator:
             t -= 2.625 / d1
             return n1 * t * t + 0.984375
 
-    def ease_in_out_bounce(self, t):
+    def ease_in_out_bounce(t):
         """弹跳缓入缓出"""
         if t < 0.5:
             return Operator.ease_in_bounce(t * 2) / 2
         return Operator.ease_out_bounce(t * 2 - 1) / 2 + 0.5
+
+    def lut(operator, size=LUT_SIZE):
+        """查表版本的算子，同一个算子和大小只生成一次"""
+        key = (operator, size)
+        table = _LUTS.get(key)
+        if table is None:
+            table = _LUTS[key] = EasingLUT(operator, size)
+        return table
+
+    def evaluate(operator, progress):
+        """对一组进度计算算子，查表算子直接按数组插值"""
+        if isinstance(operator, EasingLUT):
+            return operator.evaluate(progress)
+        return np.array([operator(t) for t in progress.tolist()], dtype=float)
+
+
+_LUTS = {}
+
+
+class EasingLUT:
+    """预计算的缓动表，查表加线性插值，可以替代原算子使用"""
+
+    __slots__ = ("operator", "size", "points", "table", "values", "scale")
+
+    def __init__(self, operator, size=LUT_SIZE):
+        self.operator = operator
+        self.size = size
+        self.points = np.linspace(0.0, 1.0, size)
+        self.table = np.array([operator(t) for t in self.points.tolist()], dtype=float)
+        self.values = self.table.tolist()  # 单次查表用 list 比 numpy 标量快
+        self.scale = size - 1
+
+    def __call__(self, t):
+        if t <= 0:
+            return self.values[0]
+        if t >= 1:
+            return self.values[-1]
+        x = t * self.scale
+        i = int(x)
+        a = self.values[i]
+        return a + (self.values[i + 1] - a) * (x - i)
+
+    def evaluate(self, progress):
+        return np.interp(progress, self.points, self.table)
@@ -1,10 +1,71 @@
 import random
+import threading
 import time
-from PIL import Image, ImageDraw
+from collections import OrderedDict
+from PIL import Image
+from ui.glyphs import atlas_for
 
 SCROLL_START_TIME = time.time()
 SCROLL_SPEED = 0.2  # speed parameter, 1.0, means 1 unit per second
 STOP_FRAMES = 32  # 停顿的帧数
+TEXT_CACHE_SIZE = 64  # 缓存的文字位图数量
+
+
+class TextCache:
+    """LRU cache of rasterized text bitmaps
+
+    Keyed by (font, text, align, width). A text that fits is stored as the
+    final aligned bitmap, a scrolling text as the full strip that each frame
+    crops from, so FreeType only runs when the text changes.
+    """
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        return {
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# shared by every draw_scroll_text call
+TEXT_CACHE = TextCache()
 
 # 绘制左侧 VU 效果（32x32 区域）
 def draw_vu(draw, volume_level = 0.5, offset_x=0, center_y=14):
@@ -39,34 +100,55 @@ def _get_step_time():
     return int(elapsed * SCROLL_SPEED * 1000 / 16)  # 16ms is a unit
 
 
-# 右侧文字滚动
-def draw_scroll_text(draw, text, position=(32, 0), width=None, font=None, align="left"):
-    x, y = position
-    text = f"{text} "
-    bbox = font.getbbox(text)
+def _render_text(text, font, width, align):
+    """rasterize text once, returns (bitmap, visible_width)
+
+    bitmap is the aligned visible bitmap when the text fits, otherwise the
+    full text strip to crop from
+    """
+    key = (font, text, align, width)
+    entry = TEXT_CACHE.get(key)
+    if entry is not None:
+        return entry
+
+    glyphs = atlas_for(font)
+    bbox = glyphs.getbbox(text)
     
     # 计算文字尺寸
     text_width = bbox[2]
     text_height = bbox[3]
-    # print(f"text: {text}, text_width: {text_width}, visible_width: {visible_width}")
     
     if width is None:
         visible_width = text_width
     else:
         visible_width = width
     
-    bitmap = Image.new('1', (visible_width, text_height))
-    draw_bitmap = ImageDraw.Draw(bitmap)
-    
     if text_width <= visible_width:
         # 文字不需要滚动，直接显示
+        bitmap = Image.new('1', (visible_width, text_height))
         if align=="center":
-            draw_bitmap.text(((visible_width - text_width) / 2, 0), text, font=font, fill=255)
+            glyphs.draw(bitmap, ((visible_width - text_width) / 2, 0), text)
         elif align=="right":
-            draw_bitmap.text((visible_width - text_width, 0), text, font=font, fill=255)
+            glyphs.draw(bitmap, (visible_width - text_width, 0), text)
         else:
-            draw_bitmap.text((0, 0), text, font=font, fill=255)
+            glyphs.draw(bitmap, (0, 0), text)
     else:
+        # 文字需要滚动，缓存整条文字
+        bitmap = glyphs.render(text)
+
+    entry = (bitmap, visible_width)
+    TEXT_CACHE.put(key, entry)
+    return entry
+
+
+# 右侧文字滚动
+def draw_scroll_text(draw, text, position=(32, 0), width=None, font=None, align="left"):
+    x, y = position
+    text = f"{text} "
+    bitmap, visible_width = _render_text(text, font, width, align)
+    text_width, text_height = bitmap.size
+    
+    if text_width > visible_width:
         # 文字需要滚动
         # 计算最大滚动距离
         max_scroll = text_width - visible_width
@@ -90,9 +172,7 @@ def draw_scroll_text(draw, text, position=(32, 0), width=None, font=None, align=
             # 在右端停顿
             scroll_x = 0
         
-        # 绘制文字
-        
-        draw_bitmap.text((-scroll_x, 0), text, font=font, fill=255)
+        # 从缓存的文字条中截取可见部分
+        bitmap = bitmap.crop((scroll_x, 0, scroll_x + visible_width, text_height))
 
-    # draw_bitmap.rectangle((0, 0, visible_width-1, text_height-1), outline=255)
     draw.bitmap((x, y), bitmap, fill=255)
@@ -3,9 +3,10 @@ import random
 import time
 import math
 from ui.animation import Animation
-from ui.matrix import Matrix
+from ui.timer import TIMERS
+from ui.timeline import TIMELINE, Track, Sequence, Wait, Call
 
-from .emotion_pattern import PATTERN
+from .emotion_pattern import BITMAP
 
 WIDTH, HEIGHT = 80, 32  # 修改宽度为80
 LOOK_DURATION = 2  # 每个位置停留2秒
@@ -44,6 +45,7 @@ LOOK_AROUND_DURATION = 2
 FURROWED_INTERVAL = 5
 FURROWED_MAX_INTERVAL = 10
 ANIMATION_DURATION = 0.2
+EYE_SPRITE_SIZE = 22
 
 # 绘制旋转的矩形
 def _draw_rotated_rectangle(draw, x1, y1, x2, y2, angle, fill=0):
@@ -83,6 +85,48 @@ def _draw_rotated_rectangle(draw, x1, y1, x2, y2, angle, fill=0):
     # 绘制旋转后的矩形
     draw.polygon(rotated_points, fill=fill)
 
+# 眼睛精灵缓存
+class EyeSpriteCache:
+    """pre-rendered eye images keyed by (state, mask_rotation, mirrored)
+
+    eye states form a small finite set, so each one is drawn once and then
+    pasted by reference. mask_rotation only changes the furrowed eye and is
+    ignored in the key for the others.
+    """
+
+    def __init__(self, draw_eye):
+        self._draw_eye = draw_eye
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, state, mask_rotation=0, mirrored=False):
+        key = (state, mask_rotation if state == "furrowed" else 0, mirrored)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        if mirrored:
+            sprite = self.get(state, mask_rotation, False).transpose(Image.FLIP_LEFT_RIGHT)
+        else:
+            sprite = Image.new("1", (EYE_SPRITE_SIZE, EYE_SPRITE_SIZE), 0)
+            self._draw_eye(ImageDraw.Draw(sprite), state, key[1])
+        self.sprites[key] = sprite
+        return sprite
+
+    def warm(self):
+        """build the sprites of every emotion up front"""
+        for expr in EMOTIONS.values():
+            left, right = expr.get("mask_rotation", [0, 0])
+            self.get(expr["left_eye"], left, False)
+            self.get(expr["right_eye"], right, True)
+
+    def get_stats(self):
+        return {"sprites": len(self.sprites), "hits": self.hits, "misses": self.misses}
+
+
 # 机器人表情类
 class RobotEmotion:
     def __init__(self):
@@ -113,11 +157,17 @@ class RobotEmotion:
         self.current_emotion = ""
         self.base_emotion = {}
         
-        # 动画队列
-        self.animation_queues = {}
+        # 动画事件，按名字分组放在共享的定时器队列里
+        self.timers = TIMERS
+        self.animation_groups = set()
         self.is_looking_around = False
         self.is_furrowed = False
+        self.timeline = TIMELINE
+        self.animations = self._build_animations()
         
+        self._dirty = True  # state changed since the last make_face
+        self.eye_sprites = EyeSpriteCache(self.draw_eye)
+        self.face = Image.new("1", (WIDTH, HEIGHT), 0)
         self.set_emotion("neutral")
 
     # 绘制眼睛
@@ -186,60 +236,62 @@ class RobotEmotion:
             draw.ellipse((x1-2, y1-2, x2+2, y2+2), fill=255)
         elif state == "hearts":
             # 绘制爱心
-            matrix = Matrix(draw)
-            matrix.set_matrix(PATTERN.HEARTS)
-            matrix.draw((x1, y1))
+            BITMAP.HEARTS.draw((x1, y1), draw=draw)
             
     # 绘制表情
     def make_face(self):
-        img = Image.new("1", (WIDTH, HEIGHT), 0)
+        self._dirty = False
+        img = self.face
+        img.paste(0, (0, 0, WIDTH, HEIGHT))
         # 处理眼睛位置动画
         eye_offset_x = self.anim.run("eye_position_x",self.target_offset_x,self.animation_duration)
         eye_offset_y = self.anim.run("eye_position_y",self.target_offset_y,self.animation_duration)
         
+        # 左眼，确保坐标是整数
+        left_eye = self.eye_sprites.get(self.left_eye_state, self.mask_rotation[0], False)
+        img.paste(left_eye, (int(15+eye_offset_x), int(4+eye_offset_y)))
         
-        # 创建左眼的临时画布
-        left_eye_img = Image.new("1", (22, 22), 0)
-        left_eye_draw = ImageDraw.Draw(left_eye_img)
-        self.draw_eye(left_eye_draw, self.left_eye_state, self.mask_rotation[0])
-        # 确保坐标是整数
-        img.paste(left_eye_img, (int(15+eye_offset_x), int(4+eye_offset_y)))
-        
-        # 创建右眼的临时画布
-        right_eye_img = Image.new("1", (22, 22), 0)
-        right_eye_draw = ImageDraw.Draw(right_eye_img)
-        self.draw_eye(right_eye_draw, self.right_eye_state, self.mask_rotation[1])
-        
-        # 获取右眼区域并水平翻转
-        right_eye = right_eye_img.transpose(Image.FLIP_LEFT_RIGHT)
-
-        # 将翻转后的右眼粘贴到正确位置，确保坐标是整数
+        # 右眼为水平翻转的精灵
+        right_eye = self.eye_sprites.get(self.right_eye_state, self.mask_rotation[1], True)
         img.paste(right_eye, (int(45+eye_offset_x), int(4+eye_offset_y)))
 
         return self.draw_action(img)
 
     def draw_action(self,img):
         if self.current_emotion == "listening":
-            matrix = Matrix()
-            matrix.set_matrix(PATTERN.LISTENING[int((time.time()*2)%len(PATTERN.LISTENING))])
-            matrix.new() # create img
-            matrix.draw()
-            img.paste(matrix.img, (WIDTH - int(matrix.width * 1.6), int(3 - (time.time()*1.5)%2)))
+            matrix = BITMAP.LISTENING[int((time.time()*2)%len(BITMAP.LISTENING))]
+            img.paste(matrix.to_image(), (WIDTH - int(matrix.width * 1.6), int(3 - (time.time()*1.5)%2)))
             
         return img
     
+    # 是否需要重绘
+    def needs_redraw(self):
+        """check if update() would change the face"""
+        if self._dirty or self.current_emotion == "listening":
+            return True
+        if self.anim.is_running("eye_position_x") or self.anim.is_running("eye_position_y"):
+            return True
+
+        current_time = time.time()
+        if current_time - self.last_blink_time > self.blink_interval:
+            return True
+        if self.current_emotion == "neutral":
+            if (not self.is_looking_around and
+                current_time - self.last_look_around_time > self.look_around_interval):
+                return True
+            if (not self.is_furrowed and
+                current_time - self.last_furrowed_time > self.furrowed_interval):
+                return True
+        return False
+
     # 更新表情
     def update(self):
         current_time = time.time()
         
         if self.anim.is_running("eye_position_x") or self.anim.is_running("eye_position_y"):
             self.animation_duration = ANIMATION_DURATION #reset duration
-                
-        # 处理动画事件
-        for name, queue in self.animation_queues.items():
-            while queue and queue[0][0] <= current_time:
-                _, callback = queue.pop(0)
-                callback()
+
+        # 到期的动画事件由 DisplayManager 统一调用 TIMERS.run_due() 处理
         
         # 随机眨眼（所有表情都会眨眼）
         if current_time - self.last_blink_time > self.blink_interval:
@@ -267,6 +319,7 @@ class RobotEmotion:
 
     # 设置表情
     def set_emotion(self, name):
+        self._dirty = True
         self.animation_duration = 0.01
         self.move_eyes(0, 0)
         if self.current_emotion != name:
@@ -292,10 +345,12 @@ class RobotEmotion:
     # 安排一个动画事件
     def _schedule_animation(self, name, delay, callback):
         """安排一个动画事件"""
-        if name not in self.animation_queues:
-            self.animation_queues[name] = []
-        self.animation_queues[name].append((time.time() + delay, callback))
-        # print(f"schedule {name} animation {delay}")
+        def run():
+            callback()
+            self._dirty = True  # may run outside update(), ask for a redraw
+
+        self.animation_groups.add(name)
+        return self.timers.schedule(delay, run, group=(self, name))
 
     # 重置所有动画状态
     def _reset_animation_states(self):
@@ -304,14 +359,37 @@ class RobotEmotion:
         self.is_looking_around = False
         self.is_furrowed = False
         
-        # 只保留blink队列，清空其他所有队列
-        blink_queue = self.animation_queues.get("blink", [])
-        self.animation_queues = {"blink": blink_queue}
+        # 只保留blink事件，取消其他所有事件
+        for name in self.animation_groups - {"blink"}:
+            self.timers.cancel_group((self, name))
+        self.animation_groups &= {"blink"}
+        for name in self.animations:
+            self.timeline.stop((self, name))
         
         # 重置计时器
         self.last_look_around_time = time.time()
         self.last_furrowed_time = time.time()
 
+    # 暂停所有动画，屏幕关闭时调用
+    def pause(self):
+        """取消所有动画事件（包括眨眼）并停止时间轴上的动画"""
+        for name in self.animation_groups:
+            self.timers.cancel_group((self, name))
+        self.animation_groups.clear()
+        for name in self.animations:
+            self.timeline.stop((self, name))
+        self.is_looking_around = False
+        self.is_furrowed = False
+        if self.base_emotion:
+            self.open_eyes()  # 不要停在眨眼或跳动的中间
+
+    # 恢复动画，屏幕打开时调用
+    def resume(self):
+        """重新进入当前表情，呼吸、跳动等动画从头开始"""
+        name, self.current_emotion = self.current_emotion, ""
+        self.set_emotion(name)
+        self.last_blink_time = time.time()
+
     # 睁开眼睛，回到基本表情状态
     def open_eyes(self):
         """睁开眼睛，回到基本表情状态"""
@@ -360,38 +438,12 @@ class RobotEmotion:
     # 呼吸动画
     def breathe(self):
         """执行呼吸动画"""
-        def do_breathe(count=0):
-            if count < 100:  # 呼吸3次（上下各算一次）
-                # 交替上下移动
-                self.animation_duration = 1
-                self.move_eyes(0, -1 if count % 2 == 0 else 1)
-                self._schedule_animation("breathe", 2, lambda: do_breathe(count + 1))
-            else:
-                # 动画结束
-                self.move_eyes(0, 0)
-
-        
-        do_breathe(0)
+        self._play_animation("breathe")
 
     # 跳动动画
-    def shake(self, count=0):
+    def shake(self):
         """执行上下跳动动画"""
-            
-        def do_shake(count):
-            if count < 3:  # 跳动3次
-                # 向上跳动
-                self.move_eyes(0, -1)
-                self._schedule_animation("shake", 0.1, lambda: do_shake_down(count))
-            else:
-                # 动画结束
-                self.move_eyes(0, 0)
-                
-        def do_shake_down(count):
-            # 向下跳动
-            self.move_eyes(0, 2)
-            self._schedule_animation("shake", 0.1, lambda: do_shake(count + 1))
-        
-        do_shake(0)
+        self._play_animation("shake")
 
     # 生气动画
     def furrowed(self):
@@ -424,17 +476,52 @@ class RobotEmotion:
     # 震惊动画
     def shocked(self):
         """执行震惊动画"""
+        self._play_animation("shocked")
 
-        def do_shocked():
-            # 眼睛突然放大
-            self.left_eye_state = "wide"
-            self.right_eye_state = "wide"
-            # 0.2秒后恢复
-            self._schedule_animation("shocked", 0.2, reset_eyes)
-            
-        def reset_eyes():
-            # 恢复到基本表情状态
-            self.left_eye_state = self.base_emotion["left_eye"]
-            self.right_eye_state = self.base_emotion["right_eye"]
+    # 表情动画的关键帧数据
+    def _build_animations(self):
+        """表情动画的关键帧数据，由共享时间轴播放"""
+        def step(func, *args):
+            return Call(self._animation_step, func, *args)
+
+        return {
+            # 上下跳动3次
+            "shake": Sequence(
+                Sequence(
+                    step(self.move_eyes, 0, -1), Wait(0.1),
+                    step(self.move_eyes, 0, 2), Wait(0.1),
+                    loop=3,
+                ),
+                step(self.move_eyes, 0, 0),
+            ),
+            # 交替上下移动，每次2秒
+            "breathe": Sequence(
+                Sequence(
+                    Track(self, [(0, {"animation_duration": 1})]),
+                    step(self.move_eyes, 0, -1), Wait(2),
+                    Track(self, [(0, {"animation_duration": 1})]),
+                    step(self.move_eyes, 0, 1), Wait(2),
+                    loop=50,
+                ),
+                step(self.move_eyes, 0, 0),
+            ),
+            # 眼睛突然放大，0.2秒后恢复
+            "shocked": Sequence(
+                step(self._set_eye_states, "wide", "wide"), Wait(0.2),
+                step(self._restore_eye_states),
+            ),
+        }
+
+    def _play_animation(self, name):
+        self.timeline.play(self.animations[name], name=(self, name))
+
+    def _animation_step(self, func, *args):
+        func(*args)
+        self._dirty = True  # runs from the manager loop, ask for a redraw
+
+    def _set_eye_states(self, left, right):
+        self.left_eye_state, self.right_eye_state = left, right
 
-        do_shocked()
\ No newline at end of file
+    def _restore_eye_states(self):
+        # 恢复到基本表情状态
+        self._set_eye_states(self.base_emotion["left_eye"], self.base_emotion["right_eye"])
@@ -1,3 +1,5 @@
+from ui.matrix import Matrix
+
 class PATTERN:
     HEARTS = [
         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
@@ -58,5 +60,9 @@ class PATTERN:
             [0, 1, 1, 1, 1, 1, 1, 1, 0],
         ],
     ]
-    
-    
\ No newline at end of file
+
+
+class BITMAP:
+    """PATTERN compiled to matrices with cached images, built once at import"""
+    HEARTS = Matrix.from_pattern(PATTERN.HEARTS)
+    LISTENING = [Matrix.from_pattern(frame) for frame in PATTERN.LISTENING]
@@ -1,9 +1,91 @@
+import os
+import threading
+import time
+
 from PIL import ImageFont
 
-class Fonts:
+# 字体名称 -> (字体文件, 字号)
+FONT_SPECS = {
+    "size_5": ("assets/fonts/QuinqueFive.ttf", 5),
+    "size_8": ("assets/fonts/fusion-pixel-8px.ttf", 8),
+    "size_10": ("assets/fonts/fusion-pixel-10px.ttf", 10),
+    "size_12": ("assets/fonts/fusion-pixel-12px.ttf", 12),
+    "size_16": ("assets/fonts/fusion-pixel-8px.ttf", 16),
+}
+
+
+def _rss_bytes():
+    """resident set size of this process, None where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class FontRegistry:
+    """faces loaded on first use, one per (path, size), shared by everyone"""
+
     def __init__(self):
-        self.size_5 = ImageFont.truetype("assets/fonts/QuinqueFive.ttf", 5)
-        self.size_8 = ImageFont.truetype("assets/fonts/fusion-pixel-8px.ttf", 8)
-        self.size_10 = ImageFont.truetype("assets/fonts/fusion-pixel-10px.ttf", 10)
-        self.size_12 = ImageFont.truetype("assets/fonts/fusion-pixel-12px.ttf", 12)
-        self.size_16 = ImageFont.truetype("assets/fonts/fusion-pixel-8px.ttf", 16)
\ No newline at end of file
+        self._faces = {}
+        self._info = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, size):
+        key = (path, size)
+        face = self._faces.get(key)
+        if face is None:
+            with self._lock:
+                face = self._faces.get(key)
+                if face is None:
+                    face = self._load(path, size)
+        return face
+
+    def _load(self, path, size):
+        rss = _rss_bytes()
+        start = time.perf_counter()
+        face = ImageFont.truetype(path, size)
+        load_time = time.perf_counter() - start
+        rss_after = _rss_bytes()
+        self._faces[(path, size)] = face
+        self._info[(path, size)] = {
+            "path": path,
+            "size": size,
+            "file_bytes": os.path.getsize(path),
+            "rss_bytes": rss_after - rss if rss is not None and rss_after is not None else None,
+            "load_ms": load_time * 1e3,
+        }
+        return face
+
+    def loaded(self):
+        return list(self._faces)
+
+    def get_stats(self):
+        """loaded faces with their file size, rss growth and load time"""
+        faces = list(self._info.values())
+        return {
+            "faces": faces,
+            "file_bytes": sum(face["file_bytes"] for face in faces),
+            "rss_bytes": sum(face["rss_bytes"] or 0 for face in faces),
+            "load_ms": sum(face["load_ms"] for face in faces),
+        }
+
+
+FONT_REGISTRY = FontRegistry()
+
+
+class Fonts:
+    """named font sizes, each loaded from the registry on first access"""
+
+    def __init__(self, registry=FONT_REGISTRY):
+        self.registry = registry
+
+    def __getattr__(self, name):
+        spec = FONT_SPECS.get(name)
+        if spec is None:
+            raise AttributeError(name)
+        return self.registry.get(*spec)
+
+
+# shared named sizes
+FONTS = Fonts()
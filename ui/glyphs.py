@@ -0,0 +1,165 @@
+import math
+import threading
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+ATLAS_WIDTH = 256  # 图集宽度，高度按需翻倍
+
+
+class Glyph:
+    """position of a glyph cell in the atlas and its metrics"""
+
+    __slots__ = ("x", "y", "width", "height", "left", "top", "advance")
+
+    def __init__(self, x, y, width, height, left, top, advance):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.left = left  # ink offset from the pen position
+        self.top = top  # ink offset from the top of the line
+        self.advance = advance
+
+
+class GlyphAtlas:
+    """1-bit glyph atlas of one font at one size
+
+    Each glyph is rasterized by FreeType once, on first use (so CJK only
+    costs for the characters actually shown), and packed into shelves of
+    a shared bitmap. The bitmap keeps 8 pixels per byte, rows packed MSB
+    first like a mode "1" image, and render() unpacks only the rows its
+    glyphs sit on. Text is composed by copying the cached cells at the
+    glyph advances, which matches draw.text for the single-line pixel fonts
+    in assets/fonts.
+    """
+
+    def __init__(self, font, width=ATLAS_WIDTH):
+        self.font = font
+        self.width = width
+        # packed rows, 8 pixels per byte
+        self.pixels = np.zeros((max(8, font.getbbox("Ag")[3]), (width + 7) // 8), dtype=np.uint8)
+        self.glyphs = {}
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+        self._lock = threading.Lock()
+
+    def glyph(self, char):
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            with self._lock:
+                glyph = self.glyphs.get(char)
+                if glyph is None:
+                    glyph = self.glyphs[char] = self._rasterize(char)
+        return glyph
+
+    def warm(self, chars):
+        """rasterize chars ahead of time"""
+        for char in chars:
+            self.glyph(char)
+
+    def _rasterize(self, char):
+        left, top, right, bottom = self.font.getbbox(char)
+        advance = self.font.getlength(char)
+        width, height = max(0, right - left), max(0, bottom - top)
+        if not width or not height:
+            # blank glyphs (spaces) still extend the text box
+            return Glyph(0, 0, width, height, left, top, advance)
+
+        cell = Image.new("1", (width, height), 0)
+        ImageDraw.Draw(cell).text((-left, -top), char, font=self.font, fill=255)
+        x, y = self._allocate(width, height)
+        rows = np.unpackbits(self.pixels[y:y + height], axis=1)
+        rows[:, x:x + width] = np.array(cell, dtype=bool)
+        self.pixels[y:y + height] = np.packbits(rows, axis=1)
+        return Glyph(x, y, width, height, left, top, advance)
+
+    def _allocate(self, width, height):
+        """shelf packing: fill a row left to right, start a new row when full"""
+        width = min(width, self.width)
+        if self._shelf_x + width > self.width:
+            self._shelf_y += self._shelf_height
+            self._shelf_x = 0
+            self._shelf_height = 0
+        while self._shelf_y + height > self.pixels.shape[0]:
+            self.pixels = np.vstack([self.pixels, np.zeros_like(self.pixels)])
+        x, y = self._shelf_x, self._shelf_y
+        self._shelf_x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return x, y
+
+    def _layout(self, text):
+        pen = 0.0
+        for char in text:
+            glyph = self.glyph(char)
+            yield round(pen), glyph
+            pen += glyph.advance
+
+    def getlength(self, text):
+        return sum(self.glyph(char).advance for char in text)
+
+    def getbbox(self, text):
+        """same box as font.getbbox for single-line text"""
+        left = top = right = bottom = None
+        for pen, glyph in self._layout(text):
+            x0 = pen + glyph.left
+            x1 = x0 + glyph.width
+            y0 = glyph.top
+            y1 = y0 + glyph.height
+            left = x0 if left is None else min(left, x0)
+            top = y0 if top is None else min(top, y0)
+            right = x1 if right is None else max(right, x1)
+            bottom = y1 if bottom is None else max(bottom, y1)
+        if left is None:
+            return (0, 0, 0, 0)
+        return (left, top, right, bottom)
+
+    def render(self, text):
+        """text as a mode 1 image, the ink placed as draw.text((0, 0)) would"""
+        _, _, right, bottom = self.getbbox(text)
+        out = np.zeros((max(0, bottom), max(0, right)), dtype=bool)
+        placed = [(pen, glyph) for pen, glyph in self._layout(text) if glyph.width and glyph.height]
+        if not placed:
+            return Image.fromarray(out)
+        # unpack the band of atlas rows these glyphs use, once per string
+        first = min(glyph.y for _, glyph in placed)
+        last = max(glyph.y + glyph.height for _, glyph in placed)
+        pixels = np.unpackbits(self.pixels[first:last], axis=1).view(bool)
+        for pen, glyph in placed:
+            x, y = pen + glyph.left, glyph.top
+            # clip ink left of or above the origin
+            sx, sy = max(0, -x), max(0, -y)
+            top = glyph.y - first
+            cell = pixels[top + sy:top + glyph.height, glyph.x + sx:glyph.x + glyph.width]
+            out[y + sy:y + glyph.height, x + sx:x + glyph.width] |= cell
+        return Image.fromarray(out)
+
+    def draw(self, image, xy, text):
+        """draw text onto a mode 1 image like ImageDraw.text(xy, fill=255)"""
+        bitmap = self.render(text)
+        if bitmap.width and bitmap.height:
+            # FreeType rounds x half up and y half down
+            image.paste(255, (math.floor(xy[0] + 0.5), math.ceil(xy[1] - 0.5)), bitmap)
+
+    def get_stats(self):
+        return {
+            "glyphs": len(self.glyphs),
+            "atlas_size": (self.width, self.pixels.shape[0]),
+            "atlas_bytes": self.pixels.nbytes,
+        }
+
+
+_ATLASES = {}
+_ATLASES_LOCK = threading.Lock()
+
+
+def atlas_for(font):
+    """the shared GlyphAtlas of a font"""
+    atlas = _ATLASES.get(font)
+    if atlas is None:
+        with _ATLASES_LOCK:
+            atlas = _ATLASES.get(font)
+            if atlas is None:
+                atlas = _ATLASES[font] = GlyphAtlas(font)
+    return atlas
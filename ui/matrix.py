@@ -1,56 +1,86 @@
+import numpy as np
 from PIL import Image, ImageDraw
 
 class Matrix:
+    """1-bit pixel matrix backed by a numpy array
+
+    The mode 1 image is built with Image.frombytes on first use and cached
+    until the data changes, so drawing is one masked paste instead of a
+    point per pixel.
+    """
+
     def __init__(self, draw=None, width=0, height=0):
         self._draw = draw
         self.width = width
         self.height = height
         self.img = None # when new(), create img,default is None
-        self.matrix = [[0 for _ in range(width)] for _ in range(height)]
-        
+        self.data = np.zeros((height, width), dtype=np.uint8)
+        self._image = None  # cached mode 1 image of data
+
+    @classmethod
+    def from_pattern(cls, pattern):
+        """compile a list-of-lists pattern, the image is built right away"""
+        matrix = cls()
+        matrix.set_matrix(pattern)
+        matrix.to_image()
+        return matrix
+
     def set_pixel(self, x, y, value):
         """设置指定位置的像素值"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.matrix[y][x] = value
-            
+            self.data[y, x] = 1 if value else 0
+            self._image = None
+
     def get_pixel(self, x, y):
         """获取指定位置的像素值"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.matrix[y][x]
+            return int(self.data[y, x])
         return 0
-        
+
     def clear(self):
         """清空矩阵"""
-        self.matrix = [[0 for _ in range(self.width)] for _ in range(self.height)]
-    
+        self.data[:] = 0
+        self._image = None
+
     def new(self):
         self.img = Image.new("1", (self.width, self.height), 0)
         self._draw = ImageDraw.Draw(self.img)
         return self._draw
-        
-    def draw(self, pos=(0,0),transparent=True):
-        """绘制矩阵"""
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.matrix[y][x]:
-                    self._draw.point((x + pos[0], y + pos[1]), fill=255)
-                elif transparent == False:
-                    self._draw.point((x + pos[0], y + pos[1]), fill=0)
-                    
+
+    def to_image(self):
+        """矩阵对应的 1 位图像，数据不变时复用"""
+        if self._image is None:
+            if self.width and self.height:
+                packed = np.packbits(self.data.astype(bool), axis=1)
+                self._image = Image.frombytes("1", (self.width, self.height), packed.tobytes())
+            else:
+                self._image = Image.new("1", (self.width, self.height), 0)
+        return self._image
+
+    def draw(self, pos=(0,0),transparent=True, draw=None):
+        """绘制矩阵，transparent=False 时 0 的像素也会覆盖为黑色"""
+        if not self.width or not self.height:
+            return
+        draw = draw or self._draw
+        x, y = int(pos[0]), int(pos[1])
+        if not transparent:
+            draw.rectangle((x, y, x + self.width - 1, y + self.height - 1), fill=0)
+        draw.bitmap((x, y), self.to_image(), fill=255)
+
     def draw_pattern(self, pattern, x_offset=0, y_offset=0):
         """绘制预定义图案"""
         for y, row in enumerate(pattern):
             for x, value in enumerate(row):
                 self.set_pixel(x + x_offset, y + y_offset, value)
-                
+
     def get_matrix(self):
         """获取当前矩阵数据"""
-        return self.matrix
-        
+        return self.data.tolist()
+
     def set_matrix(self, matrix):
         """设置整个矩阵数据，并自动调整宽高"""
         if not matrix or not all(isinstance(row, list) for row in matrix):
             return
-        self.height = len(matrix)
-        self.width = len(matrix[0]) if self.height > 0 else 0
-        self.matrix = matrix 
\ No newline at end of file
+        self.data = (np.array(matrix, dtype=np.uint8) != 0).astype(np.uint8)
+        self.height, self.width = self.data.shape
+        self._image = None
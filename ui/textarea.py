@@ -1,8 +1,14 @@
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
-import os
+from PIL import Image, ImageDraw
+import json
+import threading
+import time
+import unicodedata
+from collections import deque
+from itertools import islice
 from ui.animation import Animation
 from ui.matrix import Matrix
+from ui.glyphs import atlas_for
+from ui.fonts import FONTS
 
 # 绘制一个简单的图案
 ARROW_PATTERN = [
@@ -12,115 +18,315 @@ ARROW_PATTERN = [
     [0, 1, 0],
     [0, 0, 1]
 ]
+ARROW = Matrix.from_pattern(ARROW_PATTERN)
+
+SCROLLBACK_LINES = 200  # 回看保留的行数上限，更早的文本盒子会被丢弃或写入记录文件
+RENDER_CACHE_BOXES = 8  # 保留位图的文本盒子数量
+NO_LINE_START = set("，。、！？；：）」』》〉】,.!?;:)")  # 不放在行首的标点
+
+
+def _is_wide(char):
+    """中日韩等宽字符，可以在任意字符之间换行"""
+    return unicodedata.east_asian_width(char) in ("W", "F")
+
+
+def _tokens(text):
+    """按换行位置切分：空白、中文逐字、英文按单词"""
+    token = ""
+    for char in text:
+        if char.isspace() or _is_wide(char):
+            if token:
+                yield token
+                token = ""
+            yield char
+        else:
+            token += char
+    if token:
+        yield token
+
+
+def wrap_text(text, glyphs, max_width):
+    """按实际字宽换行，中文逐字换行，英文按单词换行，过长的单词逐字拆开"""
+    lines = []
+    for paragraph in text.split("\n"):
+        line, line_width = "", 0
+        for token in _tokens(paragraph):
+            width = glyphs.getlength(token)
+            if line_width + width <= max_width:
+                line += token
+                line_width += width
+                continue
+            if token.isspace():
+                # 行尾的空白直接丢掉
+                continue
+            carry = ""
+            if token in NO_LINE_START and len(line) > 1 and _is_wide(line[-1]):
+                # 标点不放行首，把前一个字一起带到下一行
+                line, carry = line[:-1], line[-1]
+            if line.strip():
+                lines.append(line.rstrip())
+            line, line_width = "", 0
+            if carry:
+                token = carry + token
+                width = glyphs.getlength(token)
+            if width > max_width:
+                # 单词比一行还长，逐字拆开
+                for char in token:
+                    char_width = glyphs.getlength(char)
+                    if line and line_width + char_width > max_width:
+                        lines.append(line)
+                        line, line_width = "", 0
+                    line += char
+                    line_width += char_width
+            else:
+                line, line_width = token, width
+        if line.strip():
+            lines.append(line.rstrip())
+    return lines
+
+
+class TextBox:
+    """一条消息：原文、换行后的行和按需缓存的位图"""
+
+    __slots__ = ("text", "lines", "height", "image", "time")
+
+    def __init__(self, text, lines, height):
+        self.text = text
+        self.lines = lines
+        self.height = height
+        self.image = None
+        self.time = time.time()
+
 
-        
 class TextArea:
-    def __init__(self, width=64, height=32, font = None,line_spacing=2):
+    def __init__(self, width=64, height=32, font = None,line_spacing=2,
+                 max_lines=SCROLLBACK_LINES, transcript_path=None):
         self.width = width
         self.height = height
-        
+
         # 加载默认字体
         if font is None:
-            font_path = os.path.join(os.path.dirname(__file__), 'fusion-pixel-8px.ttf')
-            self.font = ImageFont.truetype(font_path, 8)  # 使用8px字体
+            self.font = FONTS.size_8  # 使用8px字体
         else:
             self.font = font
-            
-        self.text_boxes = []  # 存储所有文本盒子   
+        self.glyphs = atlas_for(self.font)  # 逐字缓存的字形
+
+        self.text_boxes = deque()  # 存储文本盒子，总行数不超过 max_lines
+        self.max_lines = max_lines
+        self.scrollback_lines = 0  # text_boxes 中的总行数
+        self.transcript_path = transcript_path  # 丢弃的文本盒子追加写入这个文件（jsonl），None 时直接丢弃
+        self.history_offset = 0  # 回看时距离最新一行的行数，0 表示跟随最新消息
+        self._history_dirty = False  # 翻页后还没有重新绘制
         self.line_height = 8  # 字体默认高度
         self.line_spacing = line_spacing  # 行间距
         self.total_line_height = self.line_height + self.line_spacing  # 总行高
 
         self.left_padding = 3
         self.max_render_boxes = 5  # 最大可见文本盒子数量，控制同时渲染的文字数量
+        self.rendered_boxes = deque(maxlen=max(RENDER_CACHE_BOXES, self.max_render_boxes))  # 带缓存位图的文本盒子
         self.last_text_box = None
         self.temp_img = None
         self.viewport_height = 0
-        
+        self.output = Image.new('1', (self.width, self.height), 0)
+        self._lock = threading.Lock()
+
         self.scroll_offset = 0  # 滚动偏移量
-        
+
         self.ani = Animation()
         self.ani.reset("scroll")
-        
+
     def append_text(self, text):
         """添加新文本，自动换行并滚动"""
-        # 将文本按宽度换行，每个中文字符占8像素
-        wrapped_lines = textwrap.wrap(text, width= (self.width - self.left_padding) // 8)  # 假设每个字符宽度为8像素
-        
-        # 创建新的文本盒子
-        self.last_text_box = {
-            'lines': wrapped_lines,
-            'height': len(wrapped_lines) * self.total_line_height
-        }
-        
-        # 更新滚动位置
-        self._update_scroll()
-        self.temp_img = None
-        # 添加到文本盒子列表
-        self.text_boxes.append(self.last_text_box)       
-        
+        # 按实际字宽换行，左右各留出边距
+        wrapped_lines = wrap_text(text, self.glyphs, self.width - self.left_padding * 2)
+
+        # 创建新的文本盒子，位图只在这里画一次
+        box = TextBox(text, wrapped_lines, len(wrapped_lines) * self.total_line_height)
+        self.last_text_box = box
+
+        with self._lock:
+            self._box_image(box)
+            # 更新滚动位置
+            self._update_scroll()
+            self.temp_img = None
+            # 添加到文本盒子列表
+            self.text_boxes.append(box)
+            self.scrollback_lines += len(box.lines)
+            self.history_offset = 0  # 新消息回到最新位置
+            self._compact()
+
+    def _compact(self):
+        """超过行数上限时丢弃最早的文本盒子，可见的盒子总是保留"""
+        spilled = []
+        while self.scrollback_lines > self.max_lines and len(self.text_boxes) > self.max_render_boxes:
+            box = self.text_boxes.popleft()
+            self.scrollback_lines -= len(box.lines)
+            box.image = None
+            spilled.append(box)
+        self.history_offset = min(self.history_offset, self._max_history_offset())
+        self._spill(spilled)
+
+    def _spill(self, boxes):
+        """把丢弃的文本盒子追加到记录文件"""
+        if not boxes or self.transcript_path is None:
+            return
+        try:
+            with open(self.transcript_path, "a", encoding="utf-8") as f:
+                for box in boxes:
+                    f.write(json.dumps({"time": box.time, "text": box.text}, ensure_ascii=False) + "\n")
+        except OSError:
+            # 记录文件只是备份，写不进去时不影响显示
+            pass
+
+    def _box_image(self, box):
+        """文本盒子的位图，只在第一次用到时绘制"""
+        if box.image is None and box.lines:
+            box.image = self._render_box(box.lines)
+            # 位图缓存满了，释放最早缓存的
+            if len(self.rendered_boxes) == self.rendered_boxes.maxlen:
+                self.rendered_boxes[0].image = None
+            self.rendered_boxes.append(box)
+        return box.image
+
+    def _render_box(self, lines):
+        """把一个文本盒子的所有行画到一张位图上"""
+        if not lines:
+            return None
+        image = Image.new('1', (self.width - self.left_padding, len(lines) * self.total_line_height), 0)
+        for i, line in enumerate(lines):
+            self.glyphs.draw(image, (self.left_padding, i * self.total_line_height), line)
+        return image
+
+    def _last_boxes(self, count):
+        start = max(0, len(self.text_boxes) - count)
+        return list(islice(self.text_boxes, start, None))
+
     def _update_scroll(self):
         """更新滚动位置"""
         # 计算最后几个文本盒子的总高度
         if len(self.text_boxes) >= self.max_render_boxes:
-            visible_boxes = self.text_boxes[-self.max_render_boxes+1:]
+            visible_boxes = self._last_boxes(self.max_render_boxes - 1)
         else:
-            visible_boxes = self.text_boxes[-self.max_render_boxes:]
-            
-        total_height = sum(box['height'] for box in visible_boxes)
-        
+            visible_boxes = self._last_boxes(self.max_render_boxes)
+
+        total_height = sum(box.height for box in visible_boxes)
+
         # 如果内容超出显示区域，需要滚动
         if total_height > self.height:
             self.scroll_offset = total_height - self.height
         else:
             self.scroll_offset = 0
-                        
+
+    def needs_redraw(self):
+        """new text waiting to be drawn or the scroll animation running"""
+        return (
+            (self.temp_img is None and not self.history_offset)
+            or self._history_dirty
+            or self.ani.is_running("scroll")
+        )
+
+    def _page_lines(self):
+        return max(1, self.height // self.total_line_height)
+
+    def _max_history_offset(self):
+        return max(0, self.scrollback_lines - self._page_lines())
+
+    def page_up(self):
+        """向前翻一页历史消息，返回是否翻动"""
+        with self._lock:
+            offset = min(self.history_offset + self._page_lines(), self._max_history_offset())
+            moved = offset != self.history_offset
+            self.history_offset = offset
+            self._history_dirty |= moved
+            return moved
+
+    def page_down(self):
+        """向后翻一页，回到最新消息时返回 False"""
+        with self._lock:
+            offset = max(0, self.history_offset - self._page_lines())
+            self._history_dirty |= offset != self.history_offset
+            self.history_offset = offset
+            return self.history_offset > 0
+
+    def scroll_to_latest(self):
+        with self._lock:
+            if self.history_offset:
+                self.history_offset = 0
+                self._history_dirty = True
+
     def render(self):
         """渲染当前显示区域"""
-        # 创建新的图像
-        
-        if self.temp_img is None:
-            visible_boxes = self.text_boxes[-self.max_render_boxes:]
-            total_height = sum(box['height'] for box in visible_boxes)
-
-            self.temp_img = Image.new('1', (self.width-self.left_padding, total_height), 0)
-            draw = ImageDraw.Draw(self.temp_img)
-            
-            # 当前绘制位置
-            y = -self.scroll_offset
-            
-            # 只遍历最后几个文本盒子
-            for box in visible_boxes:
-                # 绘制每一行
-                for line in box['lines']:
-                    # 如果行在当前可见区域内或刚好在可视区外一行
-                    draw.text((self.left_padding, y), line, font=self.font, fill=255)
-                    y += self.total_line_height
-                    
-            if self.last_text_box is not None:
-                self.viewport_height = y
-                                
-                if self.viewport_height > self.height:
-                    self.ani.reset("scroll")
-        
-        
-        img = Image.new('1', (self.width, self.height), 0)
-        draw = ImageDraw.Draw(img)
-        
+        with self._lock:
+            self._history_dirty = False
+            if self.history_offset:
+                return self._render_history()
+            if self.temp_img is None:
+                visible_boxes = self._last_boxes(self.max_render_boxes)
+                total_height = sum(box.height for box in visible_boxes)
+
+                self.temp_img = Image.new('1', (self.width-self.left_padding, total_height), 0)
+
+                # 当前绘制位置
+                y = -self.scroll_offset
+
+                # 拼接缓存的文本盒子位图，不再逐行重画
+                for box in visible_boxes:
+                    image = self._box_image(box)
+                    if image is not None:
+                        self.temp_img.paste(image, (0, y))
+                    y += box.height
+
+                if self.last_text_box is not None:
+                    self.viewport_height = y
+
+                    if self.viewport_height > self.height:
+                        self.ani.reset("scroll")
+
+        # 复用输出图像
+        img = self.output
+        img.paste(0, (0, 0, self.width, self.height))
+
         target = self.viewport_height-self.height-self.line_spacing
-        
+
         bottom_offset = max(0,int(self.ani.run("scroll",target)))
         img.paste(self.temp_img, (self.left_padding-1,0 - bottom_offset))
+        return self._draw_frame(img)
+
+    def _render_history(self):
+        """回看模式：只拼接当前页用到的文本盒子"""
+        img = self.output
+        img.paste(0, (0, 0, self.width, self.height))
+
+        end = self.scrollback_lines - self.history_offset
+        start = max(0, end - self._page_lines())
+        line = 0
+        for box in self.text_boxes:
+            if line >= end:
+                break
+            if line + len(box.lines) > start:
+                image = self._box_image(box)
+                if image is not None:
+                    img.paste(image, (self.left_padding-1, (line - start) * self.total_line_height))
+            line += len(box.lines)
+        return self._draw_frame(img)
+
+    def _draw_frame(self, img):
+        draw = ImageDraw.Draw(img)
         draw.line((2,1,2,self.height-1),fill=255)
-        
+
         # 绘制三角形
-        matrix = Matrix(draw)
-        matrix.set_matrix(ARROW_PATTERN)
-        matrix.draw((0, 8),transparent=False)
+        ARROW.draw((0, 8), transparent=False, draw=draw)
         return img
 
 
     def clear(self):
         """清空所有文本"""
-        self.text_boxes = []
-        self.scroll_offset = 0
\ No newline at end of file
+        with self._lock:
+            self._spill(list(self.text_boxes))
+            for box in self.text_boxes:
+                box.image = None
+            self.text_boxes.clear()
+            self.rendered_boxes.clear()
+            self.scrollback_lines = 0
+            self.history_offset = 0
+            self.scroll_offset = 0
@@ -0,0 +1,343 @@
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from ui.animation import Operator
+from until.log import LOGGER
+
+LOOP_FOREVER = -1
+# 至少这么多动画同时播放时按数组批量计算。实测（benchmark/animation.py）
+# 64/256 条轨道时批量计算并不比逐个计算快，开销主要在遍历节点，所以默认关闭
+BATCH_MIN = math.inf
+
+
+class Node(ABC):
+    """base of the timeline nodes
+
+    delay: seconds before the first iteration
+    loop: number of iterations, LOOP_FOREVER repeats until stopped
+    yoyo: every second iteration plays backwards (calls only fire forwards)
+    """
+
+    __slots__ = ("delay", "loop", "yoyo", "duration")
+
+    def __init__(self, delay=0.0, loop=1, yoyo=False):
+        self.delay = delay
+        self.loop = loop
+        self.yoyo = yoyo
+        self.duration = 0.0  # one iteration, set by subclasses
+
+    @property
+    def total(self):
+        if self.loop == LOOP_FOREVER:
+            return math.inf
+        return self.delay + self.duration * self.loop
+
+    def reset(self):
+        """clear per-playback state"""
+        pass
+
+    def advance(self, prev, now, batch=None):
+        """move from prev to now, both relative to the node start
+
+        batch: a TrackBatch collecting the eased track segments of this
+        update, None to set every value right away
+        """
+        p = prev - self.delay
+        q = now - self.delay
+        if max(p, q) < 0:
+            return
+        d = self.duration
+        if d <= 0:
+            self.play(p, q, batch)
+            return
+
+        last = math.inf if self.loop == LOOP_FOREVER else self.loop - 1
+        first = max(0, math.floor(min(p, q) / d))
+        end = min(last, math.floor(max(p, q) / d))
+        iterations = range(first, end + 1)
+        if p > q:
+            iterations = reversed(iterations)
+        for k in iterations:
+            start = k * d
+            lp = min(max(p - start, -1e-9), d)
+            lq = min(max(q - start, 0.0), d)
+            if self.yoyo and k % 2:
+                lp, lq = d - lp, d - lq
+            self.play(lp, lq, batch)
+
+    @abstractmethod
+    def play(self, prev, now, batch=None):
+        """advance inside one iteration, prev/now in [0, duration]"""
+
+
+class Track(Node):
+    """keyframes for one or more attributes of an object
+
+    keyframes: [(time, {attr: value}), ...] or [(time, {attr: value}, operator)],
+    the operator eases the segment that ends at that keyframe. An attribute
+    without a keyframe at time 0 starts from its value when the track begins.
+    Values that are not numbers switch at the keyframe (step). Any operator
+    works, including Operator.lut(op) tables.
+    """
+
+    __slots__ = ("obj", "attrs", "start_values")
+
+    def __init__(self, obj, keyframes, operator=Operator.ease_linear, delay=0.0, loop=1, yoyo=False):
+        super().__init__(delay, loop, yoyo)
+        self.obj = obj
+        self.attrs = {}  # attr -> (times, values, operators)
+        for frame in sorted(keyframes, key=lambda frame: frame[0]):
+            at, values = frame[0], frame[1]
+            op = frame[2] if len(frame) > 2 else operator
+            for attr, value in values.items():
+                times, vals, ops = self.attrs.setdefault(attr, ([], [], []))
+                times.append(at)
+                vals.append(value)
+                ops.append(op)
+            self.duration = max(self.duration, at)
+        self.start_values = None
+
+    def reset(self):
+        self.start_values = None
+
+    def play(self, prev, now, batch=None):
+        if self.start_values is None:
+            self.start_values = {attr: getattr(self.obj, attr) for attr in self.attrs}
+        for attr, (times, vals, ops) in self.attrs.items():
+            i = bisect.bisect_right(times, now)
+            if i >= len(times):
+                setattr(self.obj, attr, vals[-1])
+                continue
+            if i == 0:
+                t0, v0 = 0.0, self.start_values[attr]
+            else:
+                t0, v0 = times[i - 1], vals[i - 1]
+            t1, v1 = times[i], vals[i]
+            if t1 <= t0:
+                setattr(self.obj, attr, v1)
+                continue
+            x = (now - t0) / (t1 - t0)
+            if isinstance(v0, (int, float)) and isinstance(v1, (int, float)):
+                if batch is not None:
+                    batch.add(self.obj, attr, v0, v1, ops[i], x)
+                else:
+                    setattr(self.obj, attr, v0 + (v1 - v0) * ops[i](x))
+            else:
+                setattr(self.obj, attr, v1 if ops[i](x) >= 1 else v0)
+
+
+class Wait(Node):
+    """an empty gap in a sequence"""
+
+    __slots__ = ()
+
+    def __init__(self, duration):
+        super().__init__()
+        self.duration = duration
+
+    def play(self, prev, now, batch=None):
+        pass
+
+
+class Call(Node):
+    """call a function when the playhead passes it"""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args, delay=0.0):
+        super().__init__(delay)
+        self.func = func
+        self.args = args
+
+    def play(self, prev, now, batch=None):
+        if prev < 0 <= now:
+            self.func(*self.args)
+
+
+class Group(Node):
+    __slots__ = ("children", "offsets")
+
+    def __init__(self, children, delay=0.0, loop=1, yoyo=False):
+        super().__init__(delay, loop, yoyo)
+        self.children = list(children)
+        self.offsets = [0.0] * len(self.children)
+
+    def reset(self):
+        for child in self.children:
+            child.reset()
+
+    def play(self, prev, now, batch=None):
+        lo, hi = min(prev, now), max(prev, now)
+        pairs = list(zip(self.offsets, self.children))
+        if prev > now:
+            pairs.reverse()
+        for offset, child in pairs:
+            # skip children that ended before or start after the step
+            if hi >= offset and lo - offset <= child.total:
+                child.advance(prev - offset, now - offset, batch)
+
+
+class Sequence(Group):
+    """children one after another"""
+
+    __slots__ = ()
+
+    def __init__(self, *children, delay=0.0, loop=1, yoyo=False):
+        super().__init__(children, delay, loop, yoyo)
+        offset = 0.0
+        for i, child in enumerate(self.children):
+            self.offsets[i] = offset
+            offset += child.total
+        self.duration = offset
+
+
+class Parallel(Group):
+    """children at the same time"""
+
+    __slots__ = ()
+
+    def __init__(self, *children, delay=0.0, loop=1, yoyo=False):
+        super().__init__(children, delay, loop, yoyo)
+        self.duration = max((child.total for child in self.children), default=0.0)
+
+
+class TrackBatch:
+    """numeric track segments of one update, eased per operator as arrays
+
+    Values are written when apply() runs at the end of the update, so with
+    batching on a Call sees the attributes as they were before the frame.
+    """
+
+    __slots__ = ("targets", "start", "end", "operators", "progress")
+
+    def __init__(self):
+        self.targets = []
+        self.start = []
+        self.end = []
+        self.operators = []
+        self.progress = []
+
+    def add(self, obj, attr, v0, v1, operator, progress):
+        self.targets.append((obj, attr))
+        self.start.append(v0)
+        self.end.append(v1)
+        self.operators.append(operator)
+        self.progress.append(progress)
+
+    def apply(self):
+        if not self.targets:
+            return
+        progress = np.array(self.progress, dtype=float)
+        # 同一个算子的片段一起计算
+        groups = {}
+        for index, operator in enumerate(self.operators):
+            groups.setdefault(operator, []).append(index)
+        eased = np.empty(len(progress))
+        for operator, indices in groups.items():
+            indices = np.array(indices)
+            eased[indices] = Operator.evaluate(operator, progress[indices])
+        start = np.array(self.start, dtype=float)
+        values = start + (np.array(self.end, dtype=float) - start) * eased
+        for (obj, attr), value in zip(self.targets, values.tolist()):
+            setattr(obj, attr, value)
+
+
+class Playback:
+    __slots__ = ("node", "name", "start", "last", "on_complete")
+
+    def __init__(self, node, name, start, on_complete):
+        self.node = node
+        self.name = name
+        self.start = start
+        self.last = -1e-9
+        self.on_complete = on_complete
+
+
+class Timeline:
+    """plays keyframe nodes, advanced for all playbacks in one pass per frame
+
+    An animation is data: Track keyframes composed with Sequence/Parallel,
+    each node with its own delay, loop count and yoyo. Playbacks are named
+    like timer groups so starting an animation replaces the previous one
+    with the same name. play() and stop() may be called from any thread;
+    tracks and calls run in the thread calling update(). With batch_min or
+    more playbacks, the numeric track segments of a frame are collected and
+    eased per operator as arrays (see TrackBatch).
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.batch_min = BATCH_MIN
+        self.playing = []
+        self.finished = []  # names of the playbacks that ended in the last update()
+        self._lock = threading.RLock()
+
+    def play(self, node, name=None, on_complete=None):
+        """start node now, a playback with the same name is replaced"""
+        with self._lock:
+            if name is not None:
+                self.stop(name)
+            node.reset()
+            playback = Playback(node, name, self.clock(), on_complete)
+            self.playing.append(playback)
+            return playback
+
+    def stop(self, name=None):
+        """stop playbacks by name or handle, all of them when None"""
+        with self._lock:
+            self.playing = [
+                playback for playback in self.playing
+                if name is not None and playback.name != name and playback is not name
+            ]
+            self.finished = [finished for finished in self.finished if name is not None and finished != name]
+
+    def is_playing(self, name):
+        """true once the named playback is past its delay and until the frame
+        after it ends, so redraw-on-demand plugins still draw the last keyframe"""
+        with self._lock:
+            return name in self.finished or any(
+                playback.name == name and playback.last >= playback.node.delay
+                for playback in self.playing
+            )
+
+    def update(self, now=None):
+        """advance every playback to now"""
+        with self._lock:
+            self.finished = []
+            if not self.playing:
+                return
+            if now is None:
+                now = self.clock()
+            finished = []
+            batch = TrackBatch() if len(self.playing) >= self.batch_min else None
+            for playback in list(self.playing):
+                t = now - playback.start
+                try:
+                    playback.node.advance(playback.last, t, batch)
+                except Exception as e:
+                    LOGGER.error(f"timeline {playback.name} error: {e}")
+                    t = math.inf
+                playback.last = t
+                if t >= playback.node.total:
+                    finished.append(playback)
+            if batch is not None:
+                try:
+                    batch.apply()
+                except Exception as e:
+                    LOGGER.error(f"timeline batch error: {e}")
+            for playback in finished:
+                if playback in self.playing:
+                    self.playing.remove(playback)
+                    if playback.name is not None:
+                        self.finished.append(playback.name)
+                    if playback.on_complete:
+                        playback.on_complete()
+
+
+# advanced once per frame by the display manager
+TIMELINE = Timeline()
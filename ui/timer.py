@@ -0,0 +1,129 @@
+import heapq
+import itertools
+import threading
+import time
+
+from until.log import LOGGER
+
+
+class TimerHandle:
+    """a scheduled callback, cancel() keeps it from running"""
+
+    __slots__ = ("when", "callback", "group", "cancelled")
+
+    def __init__(self, when, callback, group):
+        self.when = when
+        self.callback = callback
+        self.group = group
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerQueue:
+    """heap of delayed callbacks, dispatched from the render loop
+
+    Replaces per-action threads and per-name lists: schedule() and each
+    dispatched timer cost O(log n), cancelled handles are dropped lazily
+    when they reach the top of the heap. Callbacks can be grouped by name
+    so a whole chain (e.g. an emotion animation) is cancelled at once.
+    schedule() may be called from any thread; callbacks run in the thread
+    calling run_due(). on_reschedule, when set, is called whenever a new
+    callback becomes the earliest one, so a loop sleeping until next_due()
+    can wake up and wait again.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap = []
+        self._groups = {}
+        self._seq = itertools.count()  # keeps equal deadlines in FIFO order
+        self._lock = threading.Lock()
+        self.on_reschedule = None
+
+        # statistics
+        self.scheduled = 0
+        self.dispatched = 0
+        self.cancelled = 0
+
+    def schedule(self, delay, callback, group=None):
+        """run callback after delay seconds, returns a TimerHandle"""
+        handle = TimerHandle(self.clock() + delay, callback, group)
+        with self._lock:
+            heapq.heappush(self._heap, (handle.when, next(self._seq), handle))
+            earliest = self._heap[0][2] is handle
+            if group is not None:
+                self._groups.setdefault(group, set()).add(handle)
+            self.scheduled += 1
+        if earliest and self.on_reschedule is not None:
+            self.on_reschedule()
+        return handle
+
+    def cancel_group(self, group):
+        """cancel every pending callback of the group"""
+        with self._lock:
+            handles = self._groups.pop(group, ())
+            for handle in handles:
+                handle.cancel()
+            self.cancelled += len(handles)
+
+    def has_group(self, group):
+        with self._lock:
+            return any(not handle.cancelled for handle in self._groups.get(group, ()))
+
+    def next_due(self):
+        """time of the earliest pending callback, None when empty"""
+        with self._lock:
+            self._drop_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        """run every callback whose time has come, returns how many ran"""
+        if now is None:
+            now = self.clock()
+        count = 0
+        while True:
+            with self._lock:
+                self._drop_cancelled()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, handle = heapq.heappop(self._heap)
+                self._forget(handle)
+            try:
+                handle.callback()
+            except Exception as e:
+                LOGGER.error(f"timer callback error: {e}")
+            count += 1
+        self.dispatched += count
+        return count
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for _, _, handle in self._heap if not handle.cancelled)
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            _, _, handle = heapq.heappop(self._heap)
+            self._forget(handle)
+
+    def _forget(self, handle):
+        if handle.group is None:
+            return
+        handles = self._groups.get(handle.group)
+        if handles is not None:
+            handles.discard(handle)
+            if not handles:
+                del self._groups[handle.group]
+
+    def get_stats(self):
+        return {
+            "pending": len(self),
+            "scheduled": self.scheduled,
+            "dispatched": self.dispatched,
+            "cancelled": self.cancelled,
+        }
+
+
+# shared by the display manager, plugins and ui components
+TIMERS = TimerQueue()